@@ -0,0 +1,202 @@
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from lazy_imports import lazy_import
+from cache import make_cache
+from data_handler import widen_float32
+from stat_definitions import BATTING_STATS, PITCHING_STATS, stat_columns
+import hashlib
+
+pd = lazy_import('pandas')
+pa = lazy_import('pyarrow')
+
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+# Encoded responses kept across requests, keyed by their ETag
+API_CACHE_SIZE = 512
+API_CACHE_BYTES = 64 * 1024 * 1024
+
+# Request size limits
+MAX_API_PLAYERS = 50
+MAX_API_LIMIT = 500
+
+# Decimal places in JSON floats
+JSON_DOUBLE_PRECISION = 10
+
+# Identifying columns returned alongside the requested stats
+KEY_COLUMNS = ['player_id', 'name', 'year']
+
+
+class APIError(Exception):
+    """Bad request parameters, reported to the client as a 400"""
+
+
+class MLBDataAPI:
+    """Read-only JSON / Arrow IPC routes over MLBDataHandler
+
+    Every response carries a strong ETag derived from the data version and the
+    request, so a client revalidating with If-None-Match gets a 304 without a
+    query until the next ingest. Arrow is returned for ?format=arrow or an
+    Accept header naming the Arrow stream type.
+    """
+
+    def __init__(self, data, search_caches):
+        self.data = data
+        self.search_caches = search_caches
+        self._payloads = make_cache('api', maxsize=API_CACHE_SIZE, maxbytes=API_CACHE_BYTES)
+
+    def routes(self):
+        return [
+            Route('/api/batting', self.batting),
+            Route('/api/pitching', self.pitching),
+            Route('/api/players/{stat_type}', self.players),
+            Route('/api/leaderboard/{stat_type}', self.leaderboard)
+        ]
+
+    def batting(self, request):
+        return self._respond(request, lambda: self._stats(request, is_pitching=False))
+
+    def pitching(self, request):
+        return self._respond(request, lambda: self._stats(request, is_pitching=True))
+
+    def players(self, request):
+        return self._respond(request, lambda: self._players(request))
+
+    def leaderboard(self, request):
+        return self._respond(request, lambda: self._leaderboard(request))
+
+    def _stats(self, request, is_pitching):
+        params = request.query_params
+        player_ids = _int_list(params.get('player_ids'), 'player_ids')
+        if not player_ids:
+            raise APIError("player_ids is required")
+        if len(player_ids) > MAX_API_PLAYERS:
+            raise APIError(f"At most {MAX_API_PLAYERS} player_ids per request")
+        start_year = _int_param(params, 'start')
+        end_year = _int_param(params, 'end')
+        valid = stat_columns(PITCHING_STATS if is_pitching else BATTING_STATS)
+        columns = [column for column in params.get('cols', '').split(',') if column]
+        unknown = [column for column in columns if column not in valid]
+        if unknown:
+            raise APIError(f"Unknown columns: {', '.join(unknown)}")
+
+        if is_pitching:
+            stats = self.data.get_pitching_stats_range(player_ids, start_year, end_year)
+        else:
+            stats = self.data.get_batting_stats_range(player_ids, start_year, end_year)
+        if columns and not stats.empty:
+            stats = stats[KEY_COLUMNS + [column for column in columns if column not in KEY_COLUMNS]]
+        return stats
+
+    def _players(self, request):
+        stat_type = _stat_type(request)
+        limit = min(_int_param(request.query_params, 'limit', 20), MAX_API_LIMIT)
+        index = self.search_caches[stat_type].get()
+        matches = index.search(request.query_params.get('query', ''), limit=limit)
+        return pd.DataFrame({
+            'player_id': [int(value) for value, _ in matches],
+            'label': [label for _, label in matches]
+        })
+
+    def _leaderboard(self, request):
+        stat_type = _stat_type(request)
+        params = request.query_params
+        is_pitching = stat_type == 'pitching'
+        stat = params.get('stat')
+        if stat not in stat_columns(PITCHING_STATS if is_pitching else BATTING_STATS):
+            raise APIError(f"Unknown {stat_type} stat: {stat}")
+        return self.data.get_leaderboard(
+            stat=stat,
+            start_year=_int_param(params, 'start'),
+            end_year=_int_param(params, 'end'),
+            min_qualifier=_int_param(params, 'min_qualifier', 0),
+            limit=max(1, min(_int_param(params, 'limit', 25), MAX_API_LIMIT)),
+            is_pitching=is_pitching,
+            aggregate=params.get('aggregate', '').lower() in ('1', 'true', 'yes')
+        )
+
+    def _respond(self, request, load):
+        """Serve load()'s frame in the requested format, answering revalidations with a 304"""
+        arrow = _wants_arrow(request)
+        version = self.data.get_data_version()
+        headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept'}
+        etag = None
+        if version != 'unknown':
+            # Parameter order doesn't change the response, so it doesn't change the tag
+            canonical = f"{version}|{request.url.path}|{sorted(request.query_params.multi_items())}|{arrow}"
+            etag = f'"{hashlib.sha1(canonical.encode("utf-8")).hexdigest()}"'
+            headers['ETag'] = etag
+            if _etag_matches(request.headers.get('if-none-match'), etag):
+                return Response(status_code=304, headers=headers)
+
+        body = self._payloads.get(etag) if etag else None
+        if body is None:
+            try:
+                frame = load()
+            except APIError as e:
+                return JSONResponse({'error': str(e)}, status_code=400)
+            body = _encode_arrow(frame) if arrow else _encode_json(frame)
+            # An empty frame may be a failed query; don't pin it for the data version
+            if etag and not frame.empty:
+                self._payloads.set(etag, body)
+        return Response(body, media_type=ARROW_MEDIA_TYPE if arrow else 'application/json', headers=headers)
+
+
+def _stat_type(request):
+    stat_type = request.path_params['stat_type']
+    if stat_type not in ('batting', 'pitching'):
+        raise APIError(f"Unknown player type: {stat_type}")
+    return stat_type
+
+
+def _int_param(params, name, default=None):
+    value = params.get(name)
+    if value in (None, ''):
+        if default is None:
+            raise APIError(f"{name} is required")
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise APIError(f"{name} must be an integer")
+
+
+def _int_list(value, name):
+    try:
+        return [int(item) for item in (value or '').split(',') if item.strip()]
+    except ValueError:
+        raise APIError(f"{name} must be a comma-separated list of integers")
+
+
+def _wants_arrow(request):
+    requested = request.query_params.get('format')
+    if requested is not None:
+        return requested == 'arrow'
+    return ARROW_MEDIA_TYPE in request.headers.get('accept', '')
+
+
+def _etag_matches(header, etag):
+    """If-None-Match comparison; weak validators match too, as the spec allows for GETs"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in (tag.strip().removeprefix('W/') for tag in header.split(','))
+
+
+def _encode_json(frame):
+    widened = {
+        column: widen_float32(frame[column])
+        for column in frame.columns if frame[column].dtype == 'float32'
+    }
+    if widened:
+        frame = frame.assign(**widened)
+    return frame.to_json(orient='split', index=False, double_precision=JSON_DOUBLE_PRECISION).encode('utf-8')
+
+
+def _encode_arrow(frame):
+    # The pandas schema metadata outweighs the data for small responses
+    table = pa.Table.from_pandas(frame, preserve_index=False).replace_schema_metadata(None)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
@@ -0,0 +1,256 @@
+"""Rendering benchmarks for MLBVizHandler
+
+Feeds synthetic frames shaped like get_batting_stats_range output through every
+plot type and records figure build time, serialization time and payload size,
+plus the payload gzipped and the patch sent when only the x stat changes.
+
+    python bench_rendering.py                                        # compare payload sizes against the stored baseline
+    python bench_rendering.py --save-baseline --bytes-only           # record the committed baseline
+    python bench_rendering.py --save-baseline --baseline local.json  # record a local baseline with timings too
+    python bench_rendering.py --check-times --baseline local.json    # compare timings against it as well
+
+The committed bench_rendering_baseline.json holds only the payload sizes,
+which are deterministic for a given plotly version. Timings depend on the
+machine, so timing regressions aren't gated by default: --check-times
+compares them against a baseline recorded on the same machine.
+
+Exits with status 1 when any checked metric regresses past its threshold or
+there is no baseline to compare against.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from career_index import CareerIndex, BATTING_RATE_FORMULAS
+from data_handler import _compact_frame, BATTING_COUNT_COLUMNS
+from league_baselines import WEIGHT_COLUMNS
+from stat_definitions import BATTING_STATS, BATTING_RATE_STATS, stat_columns
+from figure_patch import FigureStream
+from viz_handler import MLBVizHandler
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_rendering_baseline.json')
+
+PLOT_TYPES = ['line', 'scatter', 'bar', 'box']
+PLAYER_COUNTS = [1, 5, 25]
+YEAR_SPANS = [5, 20, 40]
+LEAGUE_SIZES = [5000, 150000]
+LAST_YEAR = 2024
+
+# Stats plotted in every case: one counting stat and one rate stat
+X_STAT = 'hr'
+Y_STAT = 'avg'
+
+# X stat the patch size is measured against
+NEXT_X_STAT = 'rbi'
+
+# Metrics that are the same on every machine
+BYTE_METRICS = ('payload_bytes', 'gzip_bytes', 'next_x_bytes')
+
+# Allowed slowdown / growth over the baseline before a metric counts as a regression
+TIME_THRESHOLD = 0.5
+BYTES_THRESHOLD = 0.05
+
+# Timing changes smaller than this are noise, whatever the ratio
+MIN_TIME_DELTA_MS = 2.0
+
+
+class SyntheticDataHandler:
+    """Stands in for MLBDataHandler, serving a career index built from the synthetic frame"""
+
+    def __init__(self, stats_df):
+        self._career_index = CareerIndex(
+            stats_df,
+            rate_stats=BATTING_RATE_STATS,
+            weight_column=WEIGHT_COLUMNS['batting'],
+            rate_formulas=BATTING_RATE_FORMULAS
+        )
+
+    def get_career_index(self, is_pitching=False):
+        return self._career_index
+
+
+def synthetic_batting_frame(players, years, seed=0):
+    """Frame with the columns, dtypes and ordering of get_batting_stats_range"""
+    rng = np.random.default_rng(seed)
+    rows = players * years
+    frame = {
+        'player_id': np.repeat(np.arange(1, players + 1), years),
+        'name': np.repeat([f"Player {i:03d}" for i in range(1, players + 1)], years),
+        'year': np.tile(np.arange(LAST_YEAR - years + 1, LAST_YEAR + 1), players)
+    }
+    for column in stat_columns(BATTING_STATS):
+        if column in BATTING_COUNT_COLUMNS:
+            frame[column] = rng.poisson(60, rows)
+        else:
+            frame[column] = rng.normal(0.3, 0.05, rows)
+    frame['pa'] = rng.integers(100, 700, rows)
+    frame['ab'] = (frame['pa'] * 0.9).astype('int64')
+    frame['hits'] = (frame['ab'] * rng.uniform(0.2, 0.33, rows)).astype('int64')
+    return _compact_frame(pd.DataFrame(frame), BATTING_COUNT_COLUMNS)
+
+
+def synthetic_league_points(seasons, seed=0):
+    """Frame with the columns and dtypes of get_league_points"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'player_id': rng.integers(1, 20000, seasons).astype('int32'),
+        'year': rng.integers(1900, LAST_YEAR + 1, seasons).astype('int16'),
+        'x': rng.poisson(12, seasons).astype('float32'),
+        'y': rng.normal(0.26, 0.03, seasons).astype('float32')
+    })
+
+
+def measure(viz, build, build_next, repeats):
+    """Best-of-repeats build and serialization times (ms), payload bytes raw and
+    gzipped, and the bytes sent to move to build_next's figure"""
+    build_times, serialize_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fig = build()
+        built = time.perf_counter()
+        payload = viz._encode_figure(fig)
+        serialize_times.append((time.perf_counter() - built) * 1000)
+        build_times.append((built - start) * 1000)
+    stream = FigureStream()
+    stream.update(payload)
+    message = stream.update(viz._encode_figure(build_next()))
+    return {
+        'build_ms': round(min(build_times), 3),
+        'serialize_ms': round(min(serialize_times), 3),
+        'payload_bytes': len(payload.encode('utf-8')),
+        'gzip_bytes': len(gzip.compress(payload.encode('utf-8'))),
+        'next_x_bytes': len(json.dumps(message, separators=(',', ':')))
+    }
+
+
+def run_benchmarks(repeats):
+    results = {}
+    for players in PLAYER_COUNTS:
+        for years in YEAR_SPANS:
+            data = synthetic_batting_frame(players, years)
+            viz = MLBVizHandler(SyntheticDataHandler(data))
+            for plot_type in PLOT_TYPES:
+                name = f"{plot_type}/players={players}/years={years}"
+                results[name] = measure(
+                    viz,
+                    lambda: viz.create_custom_plot(data, X_STAT, Y_STAT, plot_type),
+                    lambda: viz.create_custom_plot(data, NEXT_X_STAT, Y_STAT, plot_type),
+                    repeats
+                )
+                print(f"{name:<36} {format_result(results[name])}")
+
+    highlight = synthetic_batting_frame(5, 20)
+    viz = MLBVizHandler(SyntheticDataHandler(highlight))
+    for seasons in LEAGUE_SIZES:
+        league = synthetic_league_points(seasons)
+        name = f"league/seasons={seasons}"
+        results[name] = measure(
+            viz,
+            lambda: viz.create_league_plot(league, highlight, X_STAT, Y_STAT),
+            lambda: viz.create_league_plot(league, highlight, NEXT_X_STAT, Y_STAT),
+            repeats
+        )
+        print(f"{name:<36} {format_result(results[name])}")
+    return results
+
+
+def format_result(result):
+    return (
+        f"build {result['build_ms']:9.2f} ms   "
+        f"serialize {result['serialize_ms']:9.2f} ms   "
+        f"payload {result['payload_bytes']:>9,} B   "
+        f"gzip {result.get('gzip_bytes', 0):>8,} B   "
+        f"next x {result.get('next_x_bytes', 0):>8,} B"
+    )
+
+
+def payload_changes(results, baseline):
+    """Total payload bytes per plot type against the baseline"""
+    totals = {}
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        plot_type = name.split('/')[0]
+        before, after = totals.get(plot_type, (0, 0))
+        totals[plot_type] = (before + baseline[name]['payload_bytes'], after + result['payload_bytes'])
+    return {
+        plot_type: (before, after, (after - before) / before if before else 0.0)
+        for plot_type, (before, after) in totals.items()
+    }
+
+
+def find_regressions(results, baseline, time_threshold, bytes_threshold, check_times=False):
+    """Describe every metric that grew past its threshold relative to the baseline
+
+    Timings are only compared with check_times, against a baseline that has them.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ('build_ms', 'serialize_ms'):
+            if not check_times or metric not in previous:
+                continue
+            limit = previous[metric] * (1 + time_threshold)
+            if result[metric] > limit and result[metric] - previous[metric] > MIN_TIME_DELTA_MS:
+                regressions.append(f"{name} {metric}: {previous[metric]:.2f} -> {result[metric]:.2f}")
+        for metric in BYTE_METRICS:
+            if metric in previous and result[metric] > previous[metric] * (1 + bytes_threshold):
+                regressions.append(f"{name} {metric}: {previous[metric]:,} -> {result[metric]:,}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='Baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true', help='Write these results as the new baseline')
+    parser.add_argument('--bytes-only', action='store_true', help='Save only the payload sizes, leaving out timings')
+    parser.add_argument('--repeats', type=int, default=5, help='Runs per case; the fastest is kept')
+    parser.add_argument('--time-threshold', type=float, default=TIME_THRESHOLD)
+    parser.add_argument('--bytes-threshold', type=float, default=BYTES_THRESHOLD)
+    parser.add_argument('--check-times', action='store_true',
+                        help='Also fail on build/serialize slowdowns; use a baseline recorded on this machine')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.repeats)
+
+    if args.save_baseline:
+        if args.bytes_only:
+            results = {
+                name: {metric: result[metric] for metric in BYTE_METRICS}
+                for name, result in results.items()
+            }
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    print(f"\nPayload bytes per plot type against {args.baseline}:")
+    for plot_type, (before, after, change) in payload_changes(results, baseline).items():
+        print(f"  {plot_type:<8} {before:>10,} -> {after:>10,} B  ({change:+.1%})")
+    if args.check_times and not any('build_ms' in previous for previous in baseline.values()):
+        print(f"\n--check-times: {args.baseline} has no timings to compare against")
+        return 1
+    regressions = find_regressions(results, baseline, args.time_threshold, args.bytes_threshold, args.check_times)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
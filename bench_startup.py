@@ -0,0 +1,89 @@
+"""Startup benchmark for the app module
+
+Imports app.py in a fresh interpreter under `python -X importtime`, reports the
+total import time and the slowest modules, and checks that the libraries the
+app defers (see lazy_imports.py) are not pulled in at import time.
+
+    python bench_startup.py              # report and check against the budget
+    python bench_startup.py --top 40     # list more modules
+
+Exits with status 1 when the import exceeds the budget or loads a deferred library.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Libraries that should only load in the background warm-up
+DEFERRED_MODULES = ['numpy', 'pandas', 'sqlalchemy', 'plotly']
+
+# Import time (ms) above which the benchmark fails
+IMPORT_BUDGET_MS = 1000
+
+
+def import_profile(module):
+    """Wall time plus (self_us, cumulative_us, depth, name) rows from -X importtime"""
+    code = f"import {module}, sys; print(' '.join(sorted(sys.modules)))"
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=APP_DIR, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # Column header line
+            continue
+        # Nesting shows as two spaces of indent per level after a single leading space
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((self_us, cumulative_us, depth, name.strip()))
+    return wall_ms, rows, set(result.stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app', help='Module to import')
+    parser.add_argument('--repeats', type=int, default=3, help='Runs; the fastest is kept')
+    parser.add_argument('--top', type=int, default=20, help='Slowest modules to list')
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_BUDGET_MS)
+    args = parser.parse_args()
+
+    runs = [import_profile(args.module) for _ in range(args.repeats)]
+    wall_ms, rows, loaded = min(runs, key=lambda run: run[0])
+    import_ms = sum(cumulative for _, cumulative, depth, _ in rows if depth == 0) / 1000
+
+    print(f"import {args.module}: {import_ms:.1f} ms in imports, {wall_ms:.1f} ms wall (best of {args.repeats})\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for self_us, cumulative_us, depth, name in sorted(rows, key=lambda row: -row[1])[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {'  ' * depth}{name}")
+
+    failures = []
+    if import_ms > args.budget_ms:
+        failures.append(f"import took {import_ms:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+    for module in DEFERRED_MODULES:
+        if module in loaded:
+            failures.append(f"{module} is imported at startup instead of in the warm-up")
+    if failures:
+        print(f"\n{len(failures)} problem(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print(f"\nWithin the {args.budget_ms:.0f} ms budget; deferred libraries not loaded")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
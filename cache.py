@@ -0,0 +1,353 @@
+from collections import OrderedDict
+import threading
+import hashlib
+import logging
+import sqlite3
+import pickle
+import time
+import os
+
+# SQLite file shared by every worker process; unset keeps caches process-local
+SHARED_CACHE_PATH = os.getenv('MLB_SHARED_CACHE')
+
+# Total size of the shared cache before the least recently read entries go
+SHARED_CACHE_BYTES = int(os.getenv('MLB_SHARED_CACHE_BYTES', 512 * 1024 * 1024))
+
+# Reads only refresh an entry's access time when it is older than this, so
+# hot keys don't turn every read into a write
+ACCESS_RESOLUTION_SECS = 60
+
+# Sets between checks of the shared cache's total size
+EVICT_EVERY = 64
+
+# Seconds a claim() holds before another process may take it over, in case
+# the claiming process died partway through the work
+CLAIM_TTL_SECS = 600
+
+# Caches built by make_cache, by namespace, for the metrics endpoint
+_caches = {}
+
+
+class LRUCache:
+    """Thread-safe bounded least-recently-used cache with hit/miss counters
+
+    maxbytes optionally bounds the total sizeof() of the cached values as well
+    as their count, for caches holding large serialized payloads.
+    """
+
+    def __init__(self, maxsize=256, maxbytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return
+        with self._lock:
+            self.nbytes += size - self._sizes.get(key, 0)
+            self._items[key] = value
+            self._sizes[key] = size
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize or (
+                self.maxbytes is not None and self.nbytes > self.maxbytes
+            ):
+                evicted, _ = self._items.popitem(last=False)
+                self.nbytes -= self._sizes.pop(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Snapshot of size and hit rate for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._items),
+            'maxsize': self.maxsize,
+            'nbytes': self.nbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class SQLiteCache:
+    """Cache in a SQLite file that several worker processes read and write
+
+    Values are pickled. Entries are namespaced so every cache in the app can
+    share one file, and the whole file is kept under maxbytes by dropping the
+    least recently read entries. Database errors are logged and treated as
+    misses so a locked or missing file never breaks a request; entries that no
+    longer unpickle are misses too, and are deleted.
+    """
+
+    def __init__(self, path, namespace, maxbytes=SHARED_CACHE_BYTES):
+        self.path = path
+        self.namespace = namespace
+        self.maxbytes = maxbytes
+        self.hits = 0
+        self.misses = 0
+        self._sets = 0
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed)")
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            # WAL lets readers in every process proceed while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _key(self, key):
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def get(self, key, default=None):
+        digest = self._key(key)
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, accessed FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, digest)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            now = time.time()
+            if now - row[1] > ACCESS_RESOLUTION_SECS:
+                conn.execute(
+                    "UPDATE cache SET accessed = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, digest)
+                )
+            blob = row[0]
+        except sqlite3.Error as e:
+            logging.warning(f"Shared cache read failed: {str(e)}")
+            self.misses += 1
+            return default
+        try:
+            value = pickle.loads(blob)
+        except Exception as e:
+            # Truncated, or pickled by code whose classes have since changed
+            logging.warning(f"Dropping unreadable shared cache entry: {type(e).__name__}: {str(e)}")
+            self.misses += 1
+            self._delete(digest)
+            return default
+        self.hits += 1
+        return value
+
+    def _delete(self, digest):
+        try:
+            self._connect().execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, digest)
+            )
+        except sqlite3.Error as e:
+            logging.warning(f"Shared cache delete failed: {str(e)}")
+
+    def set(self, key, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.maxbytes:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, self._key(key), blob, len(blob), time.time())
+            )
+            self._sets += 1
+            if self._sets % EVICT_EVERY == 0:
+                self._evict(conn)
+        except sqlite3.Error as e:
+            logging.warning(f"Shared cache write failed: {str(e)}")
+
+    def _evict(self, conn):
+        """Drop the least recently read entries until the file is under maxbytes"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        excess = total - self.maxbytes
+        if excess <= 0:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            doomed = []
+            for namespace, key, size in conn.execute(
+                "SELECT namespace, key, size FROM cache ORDER BY accessed"
+            ):
+                if excess <= 0:
+                    break
+                doomed.append((namespace, key))
+                excess -= size
+            conn.executemany("DELETE FROM cache WHERE namespace = ? AND key = ?", doomed)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self):
+        try:
+            self._connect().execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+        except sqlite3.Error as e:
+            logging.warning(f"Shared cache clear failed: {str(e)}")
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'path': self.path,
+            'namespace': self.namespace,
+            'maxbytes': self.maxbytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+class TieredCache:
+    """Process-local LRU in front of a cache shared between worker processes"""
+
+    def __init__(self, local, shared):
+        self.local = local
+        self.shared = shared
+
+    def __len__(self):
+        return len(self.local)
+
+    def __contains__(self, key):
+        return key in self.local
+
+    def get(self, key, default=None):
+        value = self.local.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is None:
+                return default
+            self.local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        self.local.set(key, value)
+        self.shared.set(key, value)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def stats(self):
+        return {**self.local.stats(), 'shared': self.shared.stats()}
+
+
+def make_cache(namespace, maxsize=256, maxbytes=None, sizeof=len):
+    """Process-local LRU cache, backed by the shared SQLite cache when MLB_SHARED_CACHE is set"""
+    local = LRUCache(maxsize=maxsize, maxbytes=maxbytes, sizeof=sizeof)
+    cache = TieredCache(local, SQLiteCache(SHARED_CACHE_PATH, namespace)) if SHARED_CACHE_PATH else local
+    _caches[namespace] = cache
+    return cache
+
+
+def claim(name, ttl=CLAIM_TTL_SECS):
+    """Whether this process should do the one-off work called name, e.g. a warm-up per data version
+
+    With a shared cache, the first process to claim a name in the shared file
+    gets it, and keeps it on later calls; other processes get it once the
+    claim is older than ttl. Without one every process does its own work, and
+    if the file can't be reached the work is done anyway rather than skipped.
+    """
+    if not SHARED_CACHE_PATH:
+        return True
+    now = time.time()
+    try:
+        conn = sqlite3.connect(SHARED_CACHE_PATH, timeout=5, isolation_level=None)
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS claims (
+                    name TEXT PRIMARY KEY,
+                    pid INTEGER NOT NULL,
+                    claimed REAL NOT NULL
+                )
+            """)
+            pid = os.getpid()
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO claims (name, pid, claimed) VALUES (?, ?, ?)", (name, pid, now)
+            ).rowcount
+            if inserted:
+                return True
+            return conn.execute(
+                "UPDATE claims SET pid = ?, claimed = ? WHERE name = ? AND (pid = ? OR claimed < ?)",
+                (pid, now, name, pid, now - ttl)
+            ).rowcount == 1
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logging.warning(f"Shared claim of {name} failed, going ahead: {str(e)}")
+        return True
+
+
+def prometheus_text():
+    """Prometheus text exposition of every make_cache cache's size and hit rate, labelled by process"""
+    pid = os.getpid()
+    caches = [(f'pid="{pid}",namespace="{namespace}"', cache.stats()) for namespace, cache in sorted(_caches.items())]
+    tiers = []
+    for labels, stats in caches:
+        tiers.append((f'{labels},tier="local"', stats))
+        if 'shared' in stats:
+            tiers.append((f'{labels},tier="shared"', stats['shared']))
+    lines = [
+        '# HELP mlb_cache_entries Entries held in the process-local cache',
+        '# TYPE mlb_cache_entries gauge'
+    ]
+    lines.extend(f'mlb_cache_entries{{{labels}}} {stats["size"]}' for labels, stats in caches)
+    lines.extend([
+        '# HELP mlb_cache_bytes Size of the process-local cache\'s values, for caches bounded by size',
+        '# TYPE mlb_cache_bytes gauge'
+    ])
+    lines.extend(f'mlb_cache_bytes{{{labels}}} {stats["nbytes"]}' for labels, stats in caches)
+    lines.extend([
+        '# HELP mlb_cache_lookups_total Cache lookups by tier and outcome',
+        '# TYPE mlb_cache_lookups_total counter'
+    ])
+    for labels, stats in tiers:
+        lines.append(f'mlb_cache_lookups_total{{{labels},outcome="hit"}} {stats["hits"]}')
+        lines.append(f'mlb_cache_lookups_total{{{labels},outcome="miss"}} {stats["misses"]}')
+    lines.extend([
+        '# HELP mlb_cache_hit_ratio Hits over lookups since startup',
+        '# TYPE mlb_cache_hit_ratio gauge'
+    ])
+    lines.extend(f'mlb_cache_hit_ratio{{{labels}}} {stats["hit_rate"]}' for labels, stats in tiers)
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,197 @@
+import threading
+import logging
+import time
+import os
+
+from cache import claim
+
+# Popular players warmed per stat type: comma-separated player ids, or when
+# unset the top MLB_WARM_PLAYER_COUNT by combined WAR over the default years
+WARM_PLAYERS = {
+    'batting': os.getenv('MLB_WARM_BATTERS'),
+    'pitching': os.getenv('MLB_WARM_PITCHERS')
+}
+WARM_PLAYER_COUNT = int(os.getenv('MLB_WARM_PLAYER_COUNT', 20))
+
+# Seconds between checks for a data refresh that needs a re-warm
+WARM_CHECK_SECS = 60
+
+
+class CacheWarmer:
+    """Pre-renders the views most sessions open first, again after every data refresh
+
+    views maps 'batting'/'pitching' to (x_stat, y_stat, plot_type) tuples drawn
+    for each popular player over default_years; league plots are drawn once
+    without a selection. leaderboards is a list of get_leaderboard keyword
+    arguments. Figure requests passed to track() are counted as warm when the
+    warmer rendered that exact figure for the current data version.
+
+    With MLB_SHARED_CACHE set, only the worker that claims a data version
+    renders it; the rest find its figures in the shared cache.
+    """
+
+    def __init__(self, data, viz, views, default_years, leaderboards=(), player_count=WARM_PLAYER_COUNT,
+                 check_secs=WARM_CHECK_SECS):
+        self.data = data
+        self.viz = viz
+        self.views = views
+        self.default_years = default_years
+        self.leaderboards = list(leaderboards)
+        self.player_count = player_count
+        self.check_secs = check_secs
+        self.version = None
+        self.runs = 0
+        self.failures = 0
+        self.last_run_ms = 0.0
+        self.requests = 0
+        self.warm_hits = 0
+        self._warm_keys = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def popular_players(self, is_pitching=False):
+        """Player ids to warm: the configured list, else the top players by WAR"""
+        stat_type = 'pitching' if is_pitching else 'batting'
+        configured = WARM_PLAYERS[stat_type]
+        if configured:
+            return [int(id) for id in configured.split(',') if id.strip()]
+        if self.player_count <= 0:
+            return []
+        leaders = self.data.get_leaderboard(
+            stat='war',
+            start_year=self.default_years[0],
+            end_year=self.default_years[1],
+            limit=self.player_count,
+            is_pitching=is_pitching,
+            aggregate=True
+        )
+        return [] if leaders.empty else [int(id) for id in leaders['player_id']]
+
+    def warm(self):
+        """Render every configured view for the current data version"""
+        version = self.data.get_data_version()
+        if version == 'unknown':
+            return
+        # Line plots read the career indexes; warming through indexes left from
+        # the previous version would cache stale figures under the new key
+        for is_pitching in (False, True):
+            self.data.get_career_index(is_pitching)
+            if self.data.career_index_version(is_pitching) != version:
+                with self._lock:
+                    self.failures += 1
+                logging.warning(f"Career index not current for data version {version}; warming later")
+                return
+        start = time.perf_counter()
+        requests = self._figure_requests()
+        # With a shared cache one worker renders each version and the others
+        # read its figures from the shared file; they only note the keys
+        rendering = claim(f'warm:{version}')
+        keys = set()
+        failures = 0
+        if rendering:
+            for kwargs in self.leaderboards:
+                try:
+                    self.data.get_leaderboard(**kwargs)
+                except Exception as e:
+                    failures += 1
+                    logging.error(f"Error warming leaderboard {kwargs}: {str(e)}")
+            for request in requests:
+                try:
+                    self.viz.get_plot_json(**request)
+                    keys.add(self.viz.figure_key(**request))
+                except Exception as e:
+                    failures += 1
+                    stat_type = 'pitching' if request['is_pitching'] else 'batting'
+                    logging.error(
+                        f"Error warming {stat_type} {request['plot_type']} plot for {request['player_ids']}: {str(e)}"
+                    )
+        else:
+            keys = {self.viz.figure_key(**request) for request in requests}
+
+        with self._lock:
+            self.version = version
+            self._warm_keys = keys
+            self.runs += 1
+            self.failures += failures
+            self.last_run_ms = (time.perf_counter() - start) * 1000
+        if rendering:
+            logging.info(f"Warmed {len(keys)} figures for data version {version} in {self.last_run_ms:.0f} ms")
+        else:
+            logging.info(f"Data version {version} is warmed by another worker; tracking its {len(keys)} figures")
+
+    def _figure_requests(self):
+        """get_plot_json keyword arguments for every configured view"""
+        start_year, end_year = self.default_years
+        requests = []
+        for stat_type, views in self.views.items():
+            is_pitching = stat_type == 'pitching'
+            selections = [[id] for id in self.popular_players(is_pitching)]
+            for x_stat, y_stat, plot_type in views:
+                for player_ids in ([[]] if plot_type == 'league' else selections):
+                    requests.append(dict(
+                        player_ids=player_ids,
+                        start_year=start_year,
+                        end_year=end_year,
+                        x_stat=x_stat,
+                        y_stat=y_stat,
+                        plot_type=plot_type,
+                        options=[],
+                        is_pitching=is_pitching
+                    ))
+        return requests
+
+    def start(self):
+        """Watch for data refreshes in a background thread and re-warm after each one"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name='mlb-cache-warmer', daemon=True)
+            self._thread.start()
+
+    def _watch(self):
+        # self.version only moves once a warm succeeds, so a skipped warm is retried
+        while True:
+            time.sleep(self.check_secs)
+            try:
+                if self.data.get_data_version() != self.version:
+                    self.warm()
+            except Exception as e:
+                logging.error(f"Error re-warming caches: {str(e)}")
+
+    def track(self, request):
+        """Count a figure request, noting whether the warmer had already rendered it"""
+        request = {name: value for name, value in request.items() if name != 'load_data'}
+        key = self.viz.figure_key(**request)
+        with self._lock:
+            self.requests += 1
+            if key in self._warm_keys:
+                self.warm_hits += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'warm_figures': len(self._warm_keys),
+                'runs': self.runs,
+                'failures': self.failures,
+                'last_run_ms': self.last_run_ms,
+                'requests': self.requests,
+                'warm_hits': self.warm_hits,
+                'warm_hit_rate': self.warm_hits / self.requests if self.requests else 0.0
+            }
+
+    def prometheus_text(self):
+        """Prometheus text exposition of warm-up coverage, labelled by process"""
+        labels = f'pid="{os.getpid()}"'
+        with self._lock:
+            lines = [
+                '# HELP mlb_warm_figures Figures rendered by the warmer for the current data version',
+                '# TYPE mlb_warm_figures gauge',
+                f'mlb_warm_figures{{{labels}}} {len(self._warm_keys)}',
+                '# HELP mlb_warm_last_run_ms Duration of the last warm-up run',
+                '# TYPE mlb_warm_last_run_ms gauge',
+                f'mlb_warm_last_run_ms{{{labels}}} {self.last_run_ms}',
+                '# HELP mlb_warm_requests_total Figure requests by whether the warmer had rendered them',
+                '# TYPE mlb_warm_requests_total counter',
+                f'mlb_warm_requests_total{{{labels},outcome="warm"}} {self.warm_hits}',
+                f'mlb_warm_requests_total{{{labels},outcome="cold"}} {self.requests - self.warm_hits}'
+            ]
+        return '\n'.join(lines) + '\n'
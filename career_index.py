@@ -0,0 +1,138 @@
+from lazy_imports import lazy_import
+from league_baselines import innings_to_decimal
+import threading
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Rate stats with an exact definition: (numerator terms, denominator terms, scale)
+BATTING_RATE_FORMULAS = {
+    'avg': ({'hits': 1}, {'ab': 1}, 1),
+    'obp': ({'hits': 1, 'bb': 1, 'hbp': 1}, {'ab': 1, 'bb': 1, 'hbp': 1, 'sf': 1}, 1),
+    'slg': ({'hits': 1, 'doubles': 1, 'triples': 2, 'hr': 3}, {'ab': 1}, 1),
+    'iso': ({'doubles': 1, 'triples': 2, 'hr': 3}, {'ab': 1}, 1),
+    'babip': ({'hits': 1, 'hr': -1}, {'ab': 1, 'so': -1, 'hr': -1, 'sf': 1}, 1)
+}
+
+PITCHING_RATE_FORMULAS = {
+    'era': ({'earned_runs': 1}, {'innings': 1}, 9),
+    'whip': ({'bb': 1, 'hits_allowed': 1}, {'innings': 1}, 1),
+    'k_9': ({'so': 1}, {'innings': 1}, 9),
+    'bb_9': ({'bb': 1}, {'innings': 1}, 9),
+    'hr_9': ({'hr_allowed': 1}, {'innings': 1}, 9),
+    'k_bb': ({'so': 1}, {'bb': 1}, 1)
+}
+
+# Rate stats that are the sum of other rate stats
+COMPOSITE_RATES = {
+    'ops': ('obp', 'slg')
+}
+
+# Player ids and years share one sorted int64 key: player_id * YEAR_KEY + year
+YEAR_KEY = 10000
+
+
+class CareerIndex:
+    """Prefix sums over per-season stats for O(1) arbitrary year-range aggregates"""
+
+    def __init__(self, stats_df, rate_stats, weight_column, rate_formulas=None, is_pitching=False):
+        stats_df = stats_df.dropna(subset=['player_id', 'year'])
+        keys = (stats_df['player_id'].to_numpy(dtype='int64') * YEAR_KEY
+                + stats_df['year'].to_numpy(dtype='int64'))
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+
+        # Raw columns are kept compact; float64 prefixes are built on first use
+        self._values = {}
+        for column in stats_df.columns:
+            if column in ('player_id', 'year'):
+                continue
+            values = pd.to_numeric(stats_df[column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            if is_pitching and column == 'innings':
+                values = innings_to_decimal(values)
+            self._values[column] = values[order].astype('float32')
+
+        self.rate_stats = set(rate_stats)
+        self.weight_column = weight_column
+        self.rate_formulas = rate_formulas or {}
+        self._prefixes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def supports(self, stat):
+        """Whether year-range aggregates can be answered for this stat"""
+        if stat in COMPOSITE_RATES:
+            return all(self.supports(part) for part in COMPOSITE_RATES[stat])
+        if stat in self.rate_formulas:
+            numerator, denominator, _ = self.rate_formulas[stat]
+            return all(column in self._values for column in {**numerator, **denominator})
+        if stat in self.rate_stats:
+            return stat in self._values and self.weight_column in self._values
+        return stat in self._values
+
+    def value(self, stat, player_ids, start_years, end_years):
+        """Career total (counting stats) or weighted rate over each year range"""
+        lo, hi = self._bounds(player_ids, start_years, end_years)
+        return self._range_value(stat, lo, hi)
+
+    def total(self, stat, player_ids, start_years, end_years):
+        """Sum of a stat over each year range"""
+        lo, hi = self._bounds(player_ids, start_years, end_years)
+        return self._range_sum(stat, lo, hi)
+
+    def _bounds(self, player_ids, start_years, end_years):
+        """Row positions bracketing each (player, year range) query"""
+        player_ids, start_years, end_years = np.broadcast_arrays(
+            np.asarray(player_ids, dtype='int64'),
+            np.asarray(start_years, dtype='int64'),
+            np.asarray(end_years, dtype='int64')
+        )
+        base = player_ids * YEAR_KEY
+        lo = np.searchsorted(self._keys, base + start_years, side='left')
+        hi = np.searchsorted(self._keys, base + end_years, side='right')
+        return lo, np.maximum(hi, lo)
+
+    def _range_value(self, stat, lo, hi):
+        if stat in COMPOSITE_RATES:
+            return sum(self._range_value(part, lo, hi) for part in COMPOSITE_RATES[stat])
+        if stat in self.rate_formulas:
+            numerator, denominator, scale = self.rate_formulas[stat]
+            top = sum(weight * self._range_sum(column, lo, hi) for column, weight in numerator.items())
+            bottom = sum(weight * self._range_sum(column, lo, hi) for column, weight in denominator.items())
+            return scale * self._ratio(top, bottom)
+        if stat in self.rate_stats:
+            # No exact definition available, so weight each season by playing time
+            top = self._range_sum(f'{stat}*weight', lo, hi)
+            bottom = self._range_sum(f'{stat}:weight', lo, hi)
+            return self._ratio(top, bottom)
+        return self._range_sum(stat, lo, hi)
+
+    def _range_sum(self, name, lo, hi):
+        prefix = self._prefix(name)
+        return prefix[hi] - prefix[lo]
+
+    def _ratio(self, top, bottom):
+        top, bottom = np.broadcast_arrays(top, bottom)
+        result = np.full(top.shape, np.nan)
+        np.divide(top, bottom, out=result, where=bottom > 0)
+        return result
+
+    def _prefix(self, name):
+        prefix = self._prefixes.get(name)
+        if prefix is not None:
+            return prefix
+
+        with self._lock:
+            if name not in self._prefixes:
+                if '*weight' in name or ':weight' in name:
+                    stat = name.split('*')[0].split(':')[0]
+                    values = self._values[stat].astype('float64')
+                    weights = np.nan_to_num(self._values[self.weight_column].astype('float64'))
+                    weights[np.isnan(values)] = 0
+                    terms = weights * np.nan_to_num(values) if '*weight' in name else weights
+                else:
+                    terms = np.nan_to_num(self._values[name].astype('float64'))
+                self._prefixes[name] = np.concatenate(([0.0], np.cumsum(terms)))
+            return self._prefixes[name]
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The app modules import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# test_app.py and test_collection.py are manual scripts against a live
+# database and the data sources, not part of the pytest suite
+collect_ignore = ['test_app.py', 'test_collection.py']
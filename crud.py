@@ -1,13 +1,57 @@
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from . import models
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional
+
+# Rows fetched per round-trip by the streaming readers
+STREAM_BATCH_SIZE = 1000
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE, for upsert_players
+UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert
+}
 
 def get_player(db: Session, player_id: int):
     return db.query(models.Player).filter(models.Player.id == player_id).first()
 
 def get_players(db: Session, skip: int = 0, limit: int = 100):
+    # OFFSET reads and discards every skipped row; get_players_after pages in constant time
     return db.query(models.Player).offset(skip).limit(limit).all()
 
+def get_players_after(db: Session, after_id: Optional[int] = None, limit: int = 100):
+    # Keyset page: the next `limit` players by id after the last id of the
+    # previous page, so every page is an index range scan however deep it is
+    query = select(models.Player).order_by(models.Player.id).limit(limit)
+    if after_id is not None:
+        query = query.where(models.Player.id > after_id)
+    return db.scalars(query).all()
+
+def _stream(db: Session, query, batch_size: int):
+    # yield_per fetches batch_size rows at a time (through a server-side cursor
+    # on PostgreSQL) instead of loading the whole result first
+    yield from db.scalars(query.execution_options(yield_per=batch_size))
+
+def _stats_query(model, player_id: Optional[int], year: Optional[int]):
+    query = select(model).order_by(model.id)
+    if player_id is not None:
+        query = query.where(model.player_id == player_id)
+    if year is not None:
+        query = query.where(model.year == year)
+    return query
+
+def iter_players(db: Session, batch_size: int = STREAM_BATCH_SIZE) -> Iterator[models.Player]:
+    return _stream(db, select(models.Player).order_by(models.Player.id), batch_size)
+
+def iter_batting_stats(db: Session, player_id: Optional[int] = None, year: Optional[int] = None,
+                       batch_size: int = STREAM_BATCH_SIZE) -> Iterator[models.BattingStats]:
+    return _stream(db, _stats_query(models.BattingStats, player_id, year), batch_size)
+
+def iter_pitching_stats(db: Session, player_id: Optional[int] = None, year: Optional[int] = None,
+                        batch_size: int = STREAM_BATCH_SIZE) -> Iterator[models.PitchingStats]:
+    return _stream(db, _stats_query(models.PitchingStats, player_id, year), batch_size)
+
 def get_batting_stats(db: Session, player_id: int, year: Optional[int] = None):
     query = db.query(models.BattingStats).filter(models.BattingStats.player_id == player_id)
     if year:
@@ -38,4 +82,76 @@ def delete_player(db: Session, player_id: int):
     db_player = get_player(db, player_id)
     db.delete(db_player)
     db.commit()
-    return db_player 
\ No newline at end of file
+    return db_player
+
+# Bulk variants: each runs as one transaction of batched statements
+# (executemany / insertmanyvalues with RETURNING) rather than a commit and a
+# refresh per player, so round-trips stay constant as the row count grows
+
+def _load_players(db: Session, player_ids: List[int]):
+    # One SELECT repopulates every player the commit expired, in the order given
+    players = {player.id: player for player in db.scalars(
+        select(models.Player).where(models.Player.id.in_(player_ids))
+    )}
+    return [players[player_id] for player_id in player_ids if player_id in players]
+
+def create_players(db: Session, players: List[Dict[str, Any]]):
+    if not players:
+        return []
+    created = db.scalars(
+        insert(models.Player).returning(models.Player.id, sort_by_parameter_order=True),
+        players
+    ).all()
+    db.commit()
+    return _load_players(db, created)
+
+def update_players(db: Session, updates: List[Dict[str, Any]]):
+    # Each dict holds a player's id and the columns to change; an unknown id
+    # raises StaleDataError and nothing is committed
+    if not updates:
+        return []
+    # executemany batches only consecutive rows with the same columns, so group them first
+    groups = {}
+    for row in updates:
+        groups.setdefault(frozenset(row), []).append(row)
+    for rows in groups.values():
+        db.execute(update(models.Player), rows)
+    db.commit()
+    return _load_players(db, [row['id'] for row in updates])
+
+def upsert_players(db: Session, players: List[Dict[str, Any]]):
+    # Insert players by id, updating the given columns of any that already exist
+    if not players:
+        return []
+    dialect = db.get_bind().dialect.name
+    if dialect not in UPSERT_INSERTS:
+        raise NotImplementedError(f"upsert_players is not supported on {dialect}")
+    # One statement per distinct set of columns, so ON CONFLICT only sets what each row provides
+    groups = {}
+    for row in players:
+        groups.setdefault(frozenset(row), []).append(row)
+    for columns, rows in groups.items():
+        stmt = UPSERT_INSERTS[dialect](models.Player)
+        updated = {column: stmt.excluded[column] for column in sorted(columns) if column != 'id'}
+        if updated:
+            # ON CONFLICT doesn't apply the column's onupdate
+            updated['updated_at'] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=['id'], set_=updated)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=['id'])
+        db.execute(stmt, rows)
+    db.commit()
+    return _load_players(db, [row['id'] for row in players])
+
+def delete_players(db: Session, player_ids: List[int]):
+    # Returns the deleted rows; like delete_player, players with stats still
+    # referencing them fail on the foreign key
+    if not player_ids:
+        return []
+    deleted = db.execute(
+        delete(models.Player)
+        .where(models.Player.id.in_(player_ids))
+        .returning(*models.Player.__table__.columns)
+    ).all()
+    db.commit()
+    return deleted
@@ -1,4 +1,8 @@
 from . import models
+from .league_baselines import rebuild_league_baselines
+from .similarity import rebuild_similarity_cache
+from .data_version import compute_data_version
+from .stat_definitions import BATTING_STATS, PITCHING_STATS, stat_columns
 from pybaseball import (
     batting_stats,
     pitching_stats,
@@ -357,6 +361,9 @@ class MLBDataCollector:
                 for stat_type, count in test_stats.items():
                     print(f"{stat_type.capitalize()} records: {count}")
                 
+                # League overlays and percentiles read the derived tables
+                self.run_post_ingest_rollups()
+                
                 # If test year was successful, ask to continue
                 print("\nTest year completed successfully.")
                 print("Check the numbers above to confirm they look correct.")
@@ -477,6 +484,9 @@ class MLBDataCollector:
                 
                 current_year -= chunk_size
                 time.sleep(5)  # Delay between chunks to avoid rate limiting
+            
+            # Refresh derived tables now that the raw stats are in place
+            self.run_post_ingest_rollups()
                 
             return True, "Historical collection completed successfully"
             
@@ -485,6 +495,31 @@ class MLBDataCollector:
             logging.error(error_msg)
             return False, error_msg
 
+    def run_post_ingest_rollups(self):
+        """Rebuild lookup tables derived from the raw stats tables"""
+        try:
+            print("\nComputing league baselines...")
+            rebuild_league_baselines(
+                self.db.bind,
+                batting_columns=stat_columns(BATTING_STATS),
+                pitching_columns=stat_columns(PITCHING_STATS)
+            )
+            print("League baselines updated")
+        except Exception as e:
+            logging.error(f"Error computing league baselines: {str(e)}")
+        
+        try:
+            print("Rebuilding similar-season matrices...")
+            rebuild_similarity_cache(
+                self.db.bind,
+                batting_stats=stat_columns(BATTING_STATS),
+                pitching_stats=stat_columns(PITCHING_STATS),
+                version=compute_data_version(self.db.bind)
+            )
+            print("Similarity cache updated")
+        except Exception as e:
+            logging.error(f"Error rebuilding similarity cache: {str(e)}")
+
     def analyze_data_completeness(self, start_year=1876, end_year=2024, era_size=20):
         """
         Analyze data completeness across different baseball eras
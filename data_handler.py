@@ -1,10 +1,184 @@
-from sqlalchemy import create_engine, text
-import pandas as pd
+from lazy_imports import lazy_import
+from league_baselines import BASELINE_TABLE, PERCENTILE_COLUMNS, WEIGHT_COLUMNS
+from career_index import CareerIndex, BATTING_RATE_FORMULAS, PITCHING_RATE_FORMULAS, COMPOSITE_RATES
+from cache import make_cache
+from instrumentation import QueryStats
+from data_version import compute_data_version
+from similarity import load_or_build_engine
+from stat_definitions import (
+    BATTING_STATS, PITCHING_STATS, BATTING_RATE_STATS, PITCHING_RATE_STATS, stat_columns
+)
+import threading
+import time
 import logging
+import os
+
+sa = lazy_import('sqlalchemy')
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# Seconds a data version is trusted before the tables are checked again
+DATA_VERSION_TTL = 60
+
+# Leaderboards kept per (stat, range, qualifier)
+LEADERBOARD_CACHE_SIZE = 512
+
+# Stats where the leaderboard ranks the lowest values first
+LOWER_IS_BETTER = {
+    'batting': {
+        'so', 'gdp', 'cs', 'o_swing_pct', 'swstr_pct', 'cstr_pct', 'csw_pct',
+        'iffb_pct', 'soft_pct'
+    },
+    'pitching': {
+        'era', 'whip', 'bb_9', 'hr_9', 'bb_pct', 'fip', 'xfip', 'siera',
+        'hits_allowed', 'runs', 'earned_runs', 'hr_allowed', 'bb', 'ibb', 'hbp',
+        'wp', 'bk', 'losses', 'babip', 'ld_pct', 'hr_fb', 'hard_hit_pct',
+        'barrel_pct'
+    }
+}
+
+# Per-season counting columns; everything else in a range query is a rate or a
+# fractional value and is returned as float32
+BATTING_COUNT_COLUMNS = {
+    'games', 'pa', 'ab', 'runs', 'hits', 'doubles', 'triples', 'hr', 'rbi', 'sb',
+    'cs', 'bb', 'ibb', 'so', 'hbp', 'sf', 'sh', 'gdp'
+}
+PITCHING_COUNT_COLUMNS = {
+    'games', 'games_started', 'wins', 'losses', 'saves', 'holds', 'hits_allowed',
+    'runs', 'earned_runs', 'hr_allowed', 'bb', 'ibb', 'so', 'hbp', 'wp', 'bk'
+}
+
+# Playing-time floors for the league-wide scatter, matching the player lists
+LEAGUE_MIN_PA = 50
+LEAGUE_MIN_INNINGS = 10
+
+# Innings are stored in baseball notation (6.1 = 6 1/3), convert before summing
+INNINGS_SQL = "(CAST(s.innings AS INTEGER) + (s.innings - CAST(s.innings AS INTEGER)) * 10.0 / 3)"
+
+def _sum_sql(terms):
+    """SQL for a weighted sum of summed columns, e.g. SUM(hits) + 2 * SUM(triples)"""
+    parts = []
+    for column, weight in terms.items():
+        column_sql = INNINGS_SQL if column == 'innings' else f"s.{column}"
+        parts.append(f"{weight} * SUM({column_sql})")
+    return ' + '.join(parts)
+
+def _career_stat_sql(stat, stat_type):
+    """SQL aggregate for a stat over several seasons: totals for counting stats, weighted rates otherwise"""
+    if stat in COMPOSITE_RATES:
+        return ' + '.join(f"({_career_stat_sql(part, stat_type)})" for part in COMPOSITE_RATES[stat])
+    formulas = PITCHING_RATE_FORMULAS if stat_type == 'pitching' else BATTING_RATE_FORMULAS
+    rate_stats = PITCHING_RATE_STATS if stat_type == 'pitching' else BATTING_RATE_STATS
+    if stat in formulas:
+        numerator, denominator, scale = formulas[stat]
+        # Float scale keeps Postgres from doing integer division on the summed columns
+        return f"{float(scale)} * ({_sum_sql(numerator)}) / NULLIF({_sum_sql(denominator)}, 0)"
+    if stat == 'innings':
+        return f"SUM({INNINGS_SQL})"
+    if stat in rate_stats:
+        weight = INNINGS_SQL if stat_type == 'pitching' else 's.pa'
+        return (
+            f"SUM(s.{stat} * {weight}) / "
+            f"NULLIF(SUM(CASE WHEN s.{stat} IS NOT NULL THEN {weight} END), 0)"
+        )
+    return f"SUM(s.{stat})"
+
+def _compact_frame(df, count_columns):
+    """Cast a range query result to compact dtypes: small nullable ints, float32 and categorical names"""
+    dtypes = {}
+    for column in df.columns:
+        if column == 'player_id':
+            dtypes[column] = 'int32'
+        elif column == 'year':
+            dtypes[column] = 'int16'
+        elif column == 'name':
+            dtypes[column] = 'category'
+        elif column in count_columns:
+            # Season totals fit in 16 bits; nullable so missing counts stay missing
+            dtypes[column] = 'Int16'
+        else:
+            dtypes[column] = 'float32'
+    return df.astype(dtypes)
+
+def widen_float32(values):
+    """float64 copy of float32 values rounded to the ~7 significant digits float32 holds,
+    so .312 reads as .312 rather than .31200000643"""
+    values = np.asarray(values, dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = 10.0 ** (6 - np.floor(np.log10(np.abs(values))))
+        rounded = np.round(values * scale) / scale
+    return np.where(np.isfinite(rounded), rounded, values)
 
 class MLBDataHandler:
     def __init__(self, database_url):
-        self.engine = create_engine(database_url)
+        self.database_url = database_url
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        self._career_indexes = {}
+        self._career_lock = threading.Lock()
+        self._similarity_engines = {}
+        self._similarity_lock = threading.Lock()
+        self._data_version = None
+        self._data_version_checked = 0.0
+        self._leaderboard_cache = make_cache('leaderboards', maxsize=LEADERBOARD_CACHE_SIZE)
+        self.query_stats = QueryStats()
+    
+    @property
+    def engine(self):
+        """SQLAlchemy engine, created (and the driver imported) on first use"""
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = sa.create_engine(self.database_url)
+        return self._engine
+    
+    def pool_stats(self):
+        """Connection pool occupancy; empty until the engine exists, so metrics don't open it"""
+        if self._engine is None:
+            return {}
+        pool = self._engine.pool
+        stats = {'pool': type(pool).__name__}
+        # Only QueuePool-style pools track all of these
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            if hasattr(pool, name):
+                stats[name] = getattr(pool, name)()
+        # QueuePool counts overflow up from -size; only connections beyond the pool matter
+        if 'overflow' in stats:
+            stats['overflow'] = max(stats['overflow'], 0)
+        return stats
+    
+    def pool_prometheus_text(self):
+        """Prometheus text exposition of the connection pool, labelled by process"""
+        stats = self.pool_stats()
+        lines = [
+            '# HELP mlb_db_pool_connections Database connections by state',
+            '# TYPE mlb_db_pool_connections gauge'
+        ]
+        if stats:
+            labels = f'pid="{os.getpid()}",pool="{stats["pool"]}"'
+            for name, state in (('size', 'capacity'), ('checkedout', 'in_use'),
+                                ('checkedin', 'idle'), ('overflow', 'overflow')):
+                if name in stats:
+                    lines.append(f'mlb_db_pool_connections{{{labels},state="{state}"}} {stats[name]}')
+        return '\n'.join(lines) + '\n'
+    
+    def _read_sql(self, method, query, params=None):
+        """Run a query through pandas, recording its timing and result size"""
+        start = time.perf_counter()
+        try:
+            result = pd.read_sql(query, self.engine, params=params)
+        except Exception as e:
+            self.query_stats.record(method, query, params, time.perf_counter() - start, error=str(e))
+            raise
+        self.query_stats.record(
+            method,
+            query,
+            params,
+            time.perf_counter() - start,
+            rows=len(result),
+            nbytes=int(result.memory_usage(deep=True).sum())
+        )
+        return result
         
     def get_hitter_list(self):
         """Get list of all hitters"""
@@ -15,7 +189,7 @@ class MLBDataHandler:
             ORDER BY player_id
         """
         try:
-            return pd.read_sql(query, self.engine)
+            return self._read_sql('get_hitter_list', query)
         except Exception as e:
             logging.error(f"Error getting hitter list: {str(e)}")
             return pd.DataFrame()
@@ -29,18 +203,18 @@ class MLBDataHandler:
             ORDER BY player_id
         """
         try:
-            return pd.read_sql(query, self.engine)
+            return self._read_sql('get_pitcher_list', query)
         except Exception as e:
             logging.error(f"Error getting pitcher list: {str(e)}")
             return pd.DataFrame()
     
     def get_batting_stats_range(self, player_ids, start_year, end_year):
-        """Get batting statistics for selected players within year range"""
-        player_ids_str = ','.join(str(id) for id in player_ids)
-        query = f"""
+        """Get batting statistics and player names for selected players within year range"""
+        query = sa.text("""
             SELECT 
-                player_id,
-                year,
+                b.player_id,
+                p.name,
+                b.year,
                 CAST(games AS INTEGER) as games,
                 CAST(pa AS INTEGER) as pa,
                 CAST(ab AS INTEGER) as ab,
@@ -116,28 +290,35 @@ class MLBDataHandler:
                 CAST(launch_angle AS FLOAT) as launch_angle,
                 CAST(barrel_pct AS FLOAT) as barrel_pct,
                 CAST(hard_hit_pct AS FLOAT) as hard_hit_pct
-            FROM batting_stats
-            WHERE player_id IN ({player_ids_str})
-            AND year BETWEEN {start_year} AND {end_year}
+            FROM batting_stats b
+            JOIN players p ON b.player_id = p.id
+            WHERE b.player_id IN :player_ids
+            AND b.year BETWEEN :start_year AND :end_year
             AND pa > 0
             AND games > 0
-            ORDER BY year
-        """
+            ORDER BY p.name, b.year
+        """).bindparams(sa.bindparam('player_ids', expanding=True))
+        params = {
+            'player_ids': [int(id) for id in player_ids],
+            'start_year': int(start_year),
+            'end_year': int(end_year)
+        }
         try:
-            return pd.read_sql(query, self.engine)
+            data = self._read_sql('get_batting_stats_range', query, params)
+            return _compact_frame(data, BATTING_COUNT_COLUMNS)
         except Exception as e:
             logging.error(f"Error getting batting stats: {str(e)}")
             return pd.DataFrame()
             
     def get_table_columns(self, table_name):
         """Utility function to check available columns"""
-        query = f"""
+        query = sa.text("""
             SELECT column_name 
             FROM information_schema.columns 
-            WHERE table_name = '{table_name}'
-        """
+            WHERE table_name = :table_name
+        """)
         try:
-            return pd.read_sql(query, self.engine)
+            return self._read_sql('get_table_columns', query, {'table_name': table_name})
         except Exception as e:
             logging.error(f"Error getting columns: {str(e)}")
             return pd.DataFrame()
@@ -156,7 +337,7 @@ class MLBDataHandler:
             ORDER BY p.name
         """
         try:
-            return pd.read_sql(query, self.engine)
+            return self._read_sql('get_hitter_list_with_names', query)
         except Exception as e:
             logging.error(f"Error getting hitter list: {str(e)}")
             print(f"SQL Error: {str(e)}")  # Added for debugging
@@ -164,14 +345,14 @@ class MLBDataHandler:
     
     def get_player_names(self, player_ids):
         """Get player names for given IDs"""
-        player_ids_str = ','.join(f"'{id}'" for id in player_ids)
-        query = f"""
+        query = sa.text("""
             SELECT id, name
             FROM players
-            WHERE id IN ({player_ids_str})
-        """
+            WHERE id IN :player_ids
+        """).bindparams(sa.bindparam('player_ids', expanding=True))
+        params = {'player_ids': [int(id) for id in player_ids]}
         try:
-            return pd.read_sql(query, self.engine)
+            return self._read_sql('get_player_names', query, params)
         except Exception as e:
             logging.error(f"Error getting player names: {str(e)}")
             return pd.DataFrame()
@@ -190,18 +371,18 @@ class MLBDataHandler:
             ORDER BY pl.name
         """
         try:
-            return pd.read_sql(query, self.engine)
+            return self._read_sql('get_pitcher_list_with_names', query)
         except Exception as e:
             logging.error(f"Error getting pitcher list: {str(e)}")
             return pd.DataFrame()
     
     def get_pitching_stats_range(self, player_ids, start_year, end_year):
-        """Get pitching statistics for selected players within year range"""
-        player_ids_str = ','.join(str(id) for id in player_ids)
-        query = f"""
+        """Get pitching statistics and player names for selected players within year range"""
+        query = sa.text("""
             SELECT 
-                player_id,
-                year,
+                s.player_id,
+                p.name,
+                s.year,
                 innings,
                 games,
                 games_started,
@@ -266,14 +447,338 @@ class MLBDataHandler:
                 wct,
                 wcb,
                 wch
-            FROM pitching_stats
-            WHERE player_id IN ({player_ids_str})
-            AND year BETWEEN {start_year} AND {end_year}
+            FROM pitching_stats s
+            JOIN players p ON s.player_id = p.id
+            WHERE s.player_id IN :player_ids
+            AND s.year BETWEEN :start_year AND :end_year
             AND innings >= 1  -- Filter out rows with no innings pitched
-            ORDER BY year
-        """
+            ORDER BY p.name, s.year
+        """).bindparams(sa.bindparam('player_ids', expanding=True))
+        params = {
+            'player_ids': [int(id) for id in player_ids],
+            'start_year': int(start_year),
+            'end_year': int(end_year)
+        }
         try:
-            return pd.read_sql(query, self.engine)
+            data = self._read_sql('get_pitching_stats_range', query, params)
+            return _compact_frame(data, PITCHING_COUNT_COLUMNS)
         except Exception as e:
             logging.error(f"Error getting pitching stats: {str(e)}")
             return pd.DataFrame()
+
+    def get_league_baselines(self, stats, start_year, end_year, is_pitching=False):
+        """Get precomputed league means, spreads and percentile breakpoints"""
+        query = sa.text(f"""
+            SELECT 
+                stat,
+                year,
+                n,
+                weight,
+                mean,
+                std,
+                {', '.join(PERCENTILE_COLUMNS)}
+            FROM {BASELINE_TABLE}
+            WHERE stat_type = :stat_type
+            AND stat IN :stats
+            AND year BETWEEN :start_year AND :end_year
+            ORDER BY stat, year
+        """).bindparams(sa.bindparam('stats', expanding=True))
+        params = {
+            'stat_type': 'pitching' if is_pitching else 'batting',
+            'stats': list(stats),
+            'start_year': int(start_year),
+            'end_year': int(end_year)
+        }
+        try:
+            baselines = self._read_sql('get_league_baselines', query, params)
+        except Exception as e:
+            logging.error(f"Error getting league baselines: {str(e)}")
+            return pd.DataFrame()
+        if baselines.empty:
+            # League overlays and percentiles draw nothing without these rows
+            logging.warning(
+                f"No {params['stat_type']} league baselines for {params['stats']} in "
+                f"{start_year}-{end_year}; run MLBDataCollector.run_post_ingest_rollups after ingesting"
+            )
+        return baselines
+
+    def get_stats_page(self, player_ids, start_year, end_year, columns, sort_by='year', descending=True,
+                       offset=0, limit=25, is_pitching=False):
+        """Get one sorted page of season rows for the selected players, with the total row count"""
+        stat_type = 'pitching' if is_pitching else 'batting'
+        valid = stat_columns(PITCHING_STATS if is_pitching else BATTING_STATS)
+        columns = [column for column in columns if column in valid]
+        if sort_by not in valid and sort_by not in ('name', 'year'):
+            logging.error(f"Unknown {stat_type} sort column: {sort_by}")
+            return pd.DataFrame(), 0
+        sort_sql = 'p.name' if sort_by == 'name' else f"s.{sort_by}"
+        direction = 'DESC' if descending else 'ASC'
+        
+        # Same season filters as the range queries behind the plots
+        if is_pitching:
+            table, season_filter = 'pitching_stats', 's.innings >= 1'
+        else:
+            table, season_filter = 'batting_stats', 's.pa > 0 AND s.games > 0'
+        select_sql = ''.join(f",\n                s.{column}" for column in columns)
+        query = sa.text(f"""
+            SELECT 
+                p.name,
+                s.year{select_sql},
+                COUNT(*) OVER () AS total_rows
+            FROM {table} s
+            JOIN players p ON s.player_id = p.id
+            WHERE s.player_id IN :player_ids
+            AND s.year BETWEEN :start_year AND :end_year
+            AND {season_filter}
+            ORDER BY {sort_sql} {direction} NULLS LAST, p.name, s.year
+            LIMIT :limit OFFSET :offset
+        """).bindparams(sa.bindparam('player_ids', expanding=True))
+        params = {
+            'player_ids': [int(id) for id in player_ids],
+            'start_year': int(start_year),
+            'end_year': int(end_year),
+            'limit': int(limit),
+            'offset': int(offset)
+        }
+        try:
+            page = self._read_sql('get_stats_page', query, params)
+        except Exception as e:
+            logging.error(f"Error getting {stat_type} stats page: {str(e)}")
+            return pd.DataFrame(), 0
+        total = int(page['total_rows'].iloc[0]) if not page.empty else 0
+        return page.drop(columns='total_rows'), total
+    
+    def get_league_points(self, x_stat, y_stat, start_year, end_year, is_pitching=False):
+        """Get an x/y pair for every qualifying player-season in the year range"""
+        stat_type = 'pitching' if is_pitching else 'batting'
+        valid = stat_columns(PITCHING_STATS if is_pitching else BATTING_STATS)
+        for stat in (x_stat, y_stat):
+            if stat not in valid:
+                logging.error(f"Unknown {stat_type} stat for league plot: {stat}")
+                return pd.DataFrame()
+        
+        table, qualifier, minimum = (
+            ('pitching_stats', 'innings', LEAGUE_MIN_INNINGS) if is_pitching
+            else ('batting_stats', 'pa', LEAGUE_MIN_PA)
+        )
+        query = sa.text(f"""
+            SELECT 
+                s.player_id,
+                s.year,
+                s.{x_stat} AS x,
+                s.{y_stat} AS y
+            FROM {table} s
+            WHERE s.year BETWEEN :start_year AND :end_year
+            AND s.{qualifier} >= :minimum
+            AND s.{x_stat} IS NOT NULL
+            AND s.{y_stat} IS NOT NULL
+        """)
+        params = {'start_year': int(start_year), 'end_year': int(end_year), 'minimum': minimum}
+        try:
+            points = self._read_sql('get_league_points', query, params)
+            return points.astype({'player_id': 'int32', 'year': 'int16', 'x': 'float32', 'y': 'float32'})
+        except Exception as e:
+            logging.error(f"Error getting league points: {str(e)}")
+            return pd.DataFrame()
+    
+    def get_career_index(self, is_pitching=False):
+        """Get the process-wide prefix-sum index over every player's seasons for the current data version"""
+        stat_type = 'pitching' if is_pitching else 'batting'
+        version = self.get_data_version()
+        cached = self._career_indexes.get(stat_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        with self._career_lock:
+            cached = self._career_indexes.get(stat_type)
+            if cached is None or cached[0] != version:
+                if is_pitching:
+                    table, columns = 'pitching_stats', stat_columns(PITCHING_STATS)
+                    rate_stats, formulas = PITCHING_RATE_STATS, PITCHING_RATE_FORMULAS
+                else:
+                    table, columns = 'batting_stats', stat_columns(BATTING_STATS)
+                    rate_stats, formulas = BATTING_RATE_STATS, BATTING_RATE_FORMULAS
+                query = f"""
+                    SELECT player_id, year, {', '.join(columns)}
+                    FROM {table}
+                    WHERE year IS NOT NULL
+                """
+                try:
+                    stats_df = self._read_sql('get_career_index', query)
+                    index = CareerIndex(
+                        stats_df,
+                        rate_stats=rate_stats,
+                        weight_column=WEIGHT_COLUMNS[stat_type],
+                        rate_formulas=formulas,
+                        is_pitching=is_pitching
+                    )
+                except Exception as e:
+                    logging.error(f"Error building {stat_type} career index: {str(e)}")
+                    return None if cached is None else cached[1]
+                self._career_indexes[stat_type] = (version, index)
+            return self._career_indexes[stat_type][1]
+    
+    def career_index_version(self, is_pitching=False):
+        """Data version the cached career index was built from, or None before the first build"""
+        cached = self._career_indexes.get('pitching' if is_pitching else 'batting')
+        return None if cached is None else cached[0]
+    
+    def get_career_stats(self, player_ids, start_year, end_year, stats, is_pitching=False):
+        """Get career totals and weighted rates for each player over a year range"""
+        index = self.get_career_index(is_pitching)
+        if index is None:
+            return pd.DataFrame()
+        
+        player_ids = np.asarray([int(id) for id in player_ids], dtype='int64')
+        result = pd.DataFrame({'player_id': player_ids})
+        for stat in stats:
+            if index.supports(stat):
+                result[stat] = index.value(stat, player_ids, start_year, end_year)
+        return result
+
+    def get_data_version(self):
+        """Get a fingerprint of the stats tables, re-checked at most every DATA_VERSION_TTL seconds"""
+        now = time.monotonic()
+        if self._data_version is None or now - self._data_version_checked > DATA_VERSION_TTL:
+            start = time.perf_counter()
+            try:
+                self._data_version = compute_data_version(self.engine)
+                self.query_stats.record('get_data_version', 'compute_data_version', None, time.perf_counter() - start, rows=1)
+            except Exception as e:
+                self.query_stats.record('get_data_version', 'compute_data_version', None, time.perf_counter() - start, error=str(e))
+                logging.error(f"Error getting data version: {str(e)}")
+                if self._data_version is None:
+                    return 'unknown'
+            self._data_version_checked = now
+        return self._data_version
+    
+    def get_similarity_engine(self, is_pitching=False):
+        """Get the similar-seasons engine for the current data version"""
+        stat_type = 'pitching' if is_pitching else 'batting'
+        version = self.get_data_version()
+        cached = self._similarity_engines.get(stat_type)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        with self._similarity_lock:
+            cached = self._similarity_engines.get(stat_type)
+            if cached is None or cached[0] != version:
+                stats = stat_columns(PITCHING_STATS if is_pitching else BATTING_STATS)
+                try:
+                    engine = load_or_build_engine(self.engine, stat_type, stats, version)
+                except Exception as e:
+                    logging.error(f"Error loading {stat_type} similarity engine: {str(e)}")
+                    return None if cached is None else cached[1]
+                self._similarity_engines[stat_type] = (version, engine)
+            return self._similarity_engines[stat_type][1]
+    
+    def find_similar_seasons(self, player_id, year, stats=None, k=10, is_pitching=False):
+        """Get the k player-seasons most similar to one season, with names"""
+        engine = self.get_similarity_engine(is_pitching)
+        if engine is None:
+            return pd.DataFrame()
+        
+        similar = engine.query(player_id, year, stats=stats, k=k)
+        if similar.empty:
+            return similar
+        names = self.get_player_names(similar['player_id'].unique())
+        similar = similar.merge(names, left_on='player_id', right_on='id', how='left').drop(columns='id')
+        return similar
+
+    def get_leaderboard(self, stat, start_year, end_year, min_qualifier=0, limit=25,
+                        is_pitching=False, aggregate=False, ascending=None):
+        """Get the top players by a stat, per season or combined across the year range
+        
+        The qualifier is a PA (batting) or IP (pitching) minimum, applied per season
+        or to the combined total when aggregate is set.
+        """
+        stat_type = 'pitching' if is_pitching else 'batting'
+        if stat not in stat_columns(PITCHING_STATS if is_pitching else BATTING_STATS):
+            logging.error(f"Unknown {stat_type} leaderboard stat: {stat}")
+            return pd.DataFrame()
+        if ascending is None:
+            ascending = stat in LOWER_IS_BETTER[stat_type]
+        
+        key = (
+            self.get_data_version(), stat_type, stat, int(start_year), int(end_year),
+            float(min_qualifier or 0), int(limit), bool(aggregate), bool(ascending)
+        )
+        cached = self._leaderboard_cache.get(key)
+        if cached is not None:
+            return cached.copy()
+        
+        if aggregate:
+            leaderboard = self._get_career_leaderboard(stat, stat_type, *key[3:])
+        else:
+            leaderboard = self._get_season_leaderboard(stat, stat_type, *key[3:])
+        if not leaderboard.empty:
+            self._leaderboard_cache.set(key, leaderboard)
+        return leaderboard.copy()
+    
+    def _get_season_leaderboard(self, stat, stat_type, start_year, end_year, min_qualifier,
+                                limit, aggregate, ascending):
+        """Single-season leaderboard as one ORDER BY ... LIMIT query"""
+        table, qualifier = ('pitching_stats', 'innings') if stat_type == 'pitching' else ('batting_stats', 'pa')
+        query = sa.text(f"""
+            SELECT 
+                s.player_id,
+                p.name,
+                s.year,
+                s.{qualifier} AS qualifier,
+                s.{stat} AS value
+            FROM {table} s
+            JOIN players p ON s.player_id = p.id
+            WHERE s.year BETWEEN :start_year AND :end_year
+            AND s.{qualifier} >= :min_qualifier
+            AND s.{stat} IS NOT NULL
+            ORDER BY s.{stat} {'ASC' if ascending else 'DESC'}, s.{qualifier} DESC
+            LIMIT :limit
+        """)
+        params = {
+            'start_year': start_year,
+            'end_year': end_year,
+            'min_qualifier': min_qualifier,
+            'limit': limit
+        }
+        try:
+            return self._read_sql('_get_season_leaderboard', query, params)
+        except Exception as e:
+            logging.error(f"Error getting {stat} leaderboard: {str(e)}")
+            return pd.DataFrame()
+    
+    def _get_career_leaderboard(self, stat, stat_type, start_year, end_year, min_qualifier,
+                                limit, aggregate, ascending):
+        """Multi-season leaderboard: totals and weighted rates grouped per player"""
+        if stat_type == 'pitching':
+            table, qualifier_sql = 'pitching_stats', f"SUM({INNINGS_SQL})"
+        else:
+            table, qualifier_sql = 'batting_stats', "SUM(s.pa)"
+        query = sa.text(f"""
+            SELECT * FROM (
+                SELECT 
+                    s.player_id,
+                    p.name,
+                    MIN(s.year) || '-' || MAX(s.year) as years,
+                    {qualifier_sql} AS qualifier,
+                    {_career_stat_sql(stat, stat_type)} AS value
+                FROM {table} s
+                JOIN players p ON s.player_id = p.id
+                WHERE s.year BETWEEN :start_year AND :end_year
+                GROUP BY s.player_id, p.name
+                HAVING {qualifier_sql} >= :min_qualifier
+            ) totals
+            WHERE value IS NOT NULL
+            ORDER BY value {'ASC' if ascending else 'DESC'}, qualifier DESC
+            LIMIT :limit
+        """)
+        params = {
+            'start_year': start_year,
+            'end_year': end_year,
+            'min_qualifier': min_qualifier,
+            'limit': limit
+        }
+        try:
+            return self._read_sql('_get_career_leaderboard', query, params)
+        except Exception as e:
+            logging.error(f"Error getting combined {stat} leaderboard: {str(e)}")
+            return pd.DataFrame()
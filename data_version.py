@@ -0,0 +1,35 @@
+from lazy_imports import lazy_import
+import logging
+import re
+
+sa = lazy_import('sqlalchemy')
+
+STATS_VERSION_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM batting_stats) AS batting_rows,
+        (SELECT MAX(id) FROM batting_stats) AS batting_max_id,
+        (SELECT COUNT(*) FROM pitching_stats) AS pitching_rows,
+        (SELECT MAX(id) FROM pitching_stats) AS pitching_max_id,
+        (SELECT COUNT(*) FROM players) AS players_rows,
+        (SELECT MAX(id) FROM players) AS players_max_id
+"""
+
+# Catches edits to existing players (names, teams) that leave the counts alone
+PLAYERS_UPDATED_SQL = "SELECT MAX(updated_at) FROM players"
+
+
+def compute_data_version(engine):
+    """Cheap fingerprint of the stats and players tables that changes whenever an ingest or player edit does"""
+    with engine.connect() as conn:
+        row = conn.execute(sa.text(STATS_VERSION_SQL)).one()
+        parts = [str(value or 0) for value in row]
+        try:
+            updated = conn.execute(sa.text(PLAYERS_UPDATED_SQL)).scalar()
+        except sa.exc.DBAPIError as e:
+            # Databases created before players.updated_at; init_db.py adds the column
+            logging.warning(f"players.updated_at unavailable, run init_db.py: {str(e)}")
+            conn.rollback()
+        else:
+            # Digits only: versions name snapshot and similarity cache files
+            parts.append(re.sub(r'\D', '', str(updated or 0)))
+    return '-'.join(parts)
@@ -0,0 +1,48 @@
+from shiny import reactive
+import time
+
+
+def debounce(delay_secs):
+    """Delay a reactive value until it has stopped changing for delay_secs
+
+    Wraps a reactive function (typically an input) in a reactive.calc that only
+    updates once the input has been quiet for the delay, so dragging a slider
+    produces one downstream update instead of one per step. Must be called
+    inside a session's server function.
+    """
+    def wrapper(fn):
+        deadline = reactive.value(None)
+        trigger = reactive.value(0)
+        started = False
+
+        @reactive.effect(priority=102)
+        def _on_change():
+            nonlocal started
+            # Take a dependency on the input and push the deadline back
+            fn()
+            if not started:
+                # The initial value is already what debounced() returns
+                started = True
+                return
+            deadline.set(time.monotonic() + delay_secs)
+
+        @reactive.effect(priority=101)
+        def _on_timer():
+            when = deadline()
+            if when is None:
+                return
+            remaining = when - time.monotonic()
+            if remaining <= 0:
+                with reactive.isolate():
+                    deadline.set(None)
+                    trigger.set(trigger() + 1)
+            else:
+                reactive.invalidate_later(remaining)
+
+        @reactive.calc
+        @reactive.event(trigger, ignore_none=False)
+        def debounced():
+            return fn()
+
+        return debounced
+    return wrapper
@@ -0,0 +1,60 @@
+import json
+
+
+def merge_patch(previous, current):
+    """RFC 7396 merge patch that turns previous into current
+
+    Lists are replaced whole. Keys dropped from current are sent as None,
+    so a figure that legitimately holds null can't be patched this way;
+    Plotly figure JSON only uses null inside arrays.
+    """
+    patch = {}
+    for key in previous:
+        if key not in current:
+            patch[key] = None
+    for key, value in current.items():
+        if key not in previous:
+            patch[key] = value
+        elif previous[key] != value:
+            if isinstance(value, dict) and isinstance(previous[key], dict):
+                patch[key] = merge_patch(previous[key], value)
+            else:
+                patch[key] = value
+    return patch
+
+
+def figure_patch(previous, current):
+    """Patch between two figure dicts: a merge patch for the layout and one per trace"""
+    previous_data = previous.get('data', [])
+    return {
+        'layout': merge_patch(previous.get('layout', {}), current.get('layout', {})),
+        'data': [
+            merge_patch(previous_data[idx] if idx < len(previous_data) else {}, trace)
+            for idx, trace in enumerate(current.get('data', []))
+        ]
+    }
+
+
+class FigureStream:
+    """Last figure sent to one plot output, so the next can go out as a patch
+
+    Most input changes (a different axis stat, an overlay toggle, one more
+    player) leave the bulk of a figure alone; the browser keeps the previous
+    figure and applies the patch before calling Plotly.react.
+    """
+
+    def __init__(self):
+        self._last = None
+
+    def update(self, figure_json):
+        """Message for the plotly-react handler: the full figure, a patch or None to clear"""
+        if figure_json is None:
+            self._last = None
+            return {'figure': None}
+        figure = json.loads(figure_json)
+        previous, self._last = self._last, figure
+        if previous is not None:
+            patch = figure_patch(previous, figure)
+            if len(json.dumps(patch, separators=(',', ':'))) < len(figure_json):
+                return {'patch': patch}
+        return {'figure': figure_json}
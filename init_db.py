@@ -1,5 +1,7 @@
 from database import engine, Base
-from models import Player, BattingStats, PitchingStats
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+from models import Player, BattingStats, PitchingStats, LeagueBaseline
 import logging
 
 logging.basicConfig(
@@ -14,6 +16,24 @@ def init_database():
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully!")
         
+        # create_all skips tables that already exist, so add any new indexes too
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=engine, checkfirst=True)
+        logger.info("Database indexes up to date!")
+        
+        # Likewise add columns that existing tables are missing
+        inspector = inspect(engine)
+        with engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {column['name'] for column in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing:
+                        ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                        conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                        logger.info(f"Added column {table.name}.{column.name}")
+        logger.info("Database columns up to date!")
+        
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
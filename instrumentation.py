@@ -0,0 +1,240 @@
+from bisect import bisect_left
+from collections import deque
+import threading
+import logging
+import time
+import os
+import re
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+BYTE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+
+# Queries slower than this (milliseconds) go to the slow-query log
+SLOW_QUERY_MS = float(os.getenv('MLB_SLOW_QUERY_MS', 500))
+
+# Slow queries kept in memory for inspection
+SLOW_QUERY_LOG_SIZE = 200
+
+
+def normalize_sql(sql):
+    """Collapse a query to one line with literals replaced, so similar queries group together"""
+    sql = re.sub(r'--[^\n]*', ' ', str(sql))
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\bIN\s*\([^)]*\)', 'IN (...)', sql, flags=re.IGNORECASE)
+    sql = re.sub(r'(?<![\w:.])\d+(?:\.\d+)?\b', '?', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+class Histogram:
+    """Fixed-bucket histogram with a running sum, in Prometheus layout"""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self):
+        return {
+            'buckets': dict(zip(self.buckets + ('+Inf',), self.counts)),
+            'sum': self.total,
+            'count': self.count
+        }
+
+    def prometheus_lines(self, name, labels=''):
+        """Cumulative bucket, sum and count lines for a text exposition"""
+        separator = ',' if labels else ''
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.total}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class QueryStats:
+    """Per-method query timings, result sizes and a slow-query log"""
+
+    def __init__(self, slow_query_ms=SLOW_QUERY_MS, slow_log_size=SLOW_QUERY_LOG_SIZE):
+        self.slow_query_ms = slow_query_ms
+        self._methods = {}
+        self._slow_queries = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+
+    def record(self, method, sql, params, seconds, rows=0, nbytes=0, error=None):
+        elapsed_ms = seconds * 1000
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    'calls': 0,
+                    'errors': 0,
+                    'latency_ms': Histogram(LATENCY_BUCKETS_MS),
+                    'rows': Histogram(ROW_BUCKETS),
+                    'bytes': Histogram(BYTE_BUCKETS)
+                }
+            stats['calls'] += 1
+            stats['latency_ms'].observe(elapsed_ms)
+            if error is None:
+                stats['rows'].observe(rows)
+                stats['bytes'].observe(nbytes)
+            else:
+                stats['errors'] += 1
+
+            if elapsed_ms >= self.slow_query_ms:
+                entry = {
+                    'time': time.time(),
+                    'method': method,
+                    'elapsed_ms': round(elapsed_ms, 1),
+                    'rows': rows,
+                    'bytes': nbytes,
+                    'sql': normalize_sql(sql),
+                    'params': params,
+                    'error': error
+                }
+                self._slow_queries.append(entry)
+                logging.warning(
+                    f"Slow query in {method}: {elapsed_ms:.0f} ms, {rows} rows - "
+                    f"{entry['sql']} params={params}"
+                )
+
+    def snapshot(self):
+        """Plain-dict copy of every method's counters and histograms"""
+        with self._lock:
+            return {
+                method: {
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'latency_ms': stats['latency_ms'].snapshot(),
+                    'rows': stats['rows'].snapshot(),
+                    'bytes': stats['bytes'].snapshot()
+                }
+                for method, stats in self._methods.items()
+            }
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow_queries)
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+            self._slow_queries.clear()
+
+    def prometheus_text(self):
+        """Prometheus text exposition of the query metrics"""
+        with self._lock:
+            methods = sorted(self._methods.items())
+            lines = [
+                '# HELP mlb_query_calls_total Queries issued per data handler method',
+                '# TYPE mlb_query_calls_total counter'
+            ]
+            lines.extend(f'mlb_query_calls_total{{method="{method}"}} {stats["calls"]}' for method, stats in methods)
+            lines.extend([
+                '# HELP mlb_query_errors_total Failed queries per data handler method',
+                '# TYPE mlb_query_errors_total counter'
+            ])
+            lines.extend(f'mlb_query_errors_total{{method="{method}"}} {stats["errors"]}' for method, stats in methods)
+            for name, help_text in (
+                ('latency_ms', 'Query latency in milliseconds'),
+                ('rows', 'Rows returned per query'),
+                ('bytes', 'In-memory size of each query result')
+            ):
+                lines.extend([f'# HELP mlb_query_{name} {help_text}', f'# TYPE mlb_query_{name} histogram'])
+                for method, stats in methods:
+                    lines.extend(stats[name].prometheus_lines(f'mlb_query_{name}', f'method="{method}"'))
+            lines.extend([
+                '# HELP mlb_slow_queries Slow queries currently held in the slow-query log',
+                '# TYPE mlb_slow_queries gauge',
+                f'mlb_slow_queries {len(self._slow_queries)}'
+            ])
+        return '\n'.join(lines) + '\n'
+
+
+class Span:
+    """Times one render stage into RenderStats; interrupted work (a cancelled task) isn't recorded"""
+
+    __slots__ = ('stats', 'labels', 'start')
+
+    def __init__(self, stats, labels):
+        self.stats = stats
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None or issubclass(exc_type, Exception):
+            self.stats.record(self.labels, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+
+class RenderStats:
+    """Per-plot, per-stage render latencies
+
+    Stages are the figure pipeline's steps: query (range stats, baselines and
+    league points), build (the Plotly figure), serialize (figure JSON), patch
+    (the diff against the figure the browser already has) and total (request to
+    result, including worker pool queueing and figure cache hits). The cache
+    warmer's renders show up in the query, build and serialize stages but have
+    no total. A span costs two clock reads and one histogram update, a few
+    microseconds against renders of tens of milliseconds.
+    """
+
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def span(self, plot, plot_type, stage):
+        return Span(self, (plot, plot_type, stage))
+
+    def record(self, labels, seconds, error=False):
+        with self._lock:
+            stats = self._stages.get(labels)
+            if stats is None:
+                stats = self._stages[labels] = {'errors': 0, 'latency_ms': Histogram(LATENCY_BUCKETS_MS)}
+            stats['latency_ms'].observe(seconds * 1000)
+            if error:
+                stats['errors'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                '/'.join(labels): {'errors': stats['errors'], 'latency_ms': stats['latency_ms'].snapshot()}
+                for labels, stats in self._stages.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def prometheus_text(self):
+        """Prometheus text exposition of the render stage latencies, labelled by process"""
+        pid = os.getpid()
+        with self._lock:
+            stages = [
+                (f'pid="{pid}",plot="{plot}",plot_type="{plot_type}",stage="{stage}"', stats)
+                for (plot, plot_type, stage), stats in sorted(self._stages.items())
+            ]
+            lines = [
+                '# HELP mlb_render_stage_ms Figure render stage latency in milliseconds',
+                '# TYPE mlb_render_stage_ms histogram'
+            ]
+            for labels, stats in stages:
+                lines.extend(stats['latency_ms'].prometheus_lines('mlb_render_stage_ms', labels))
+            lines.extend([
+                '# HELP mlb_render_stage_errors_total Render stages that raised',
+                '# TYPE mlb_render_stage_errors_total counter'
+            ])
+            lines.extend(f'mlb_render_stage_errors_total{{{labels}}} {stats["errors"]}' for labels, stats in stages)
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,35 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """Stand-in for a module that is only imported on first attribute access
+
+    pandas, numpy, SQLAlchemy and plotly account for most of the app's import
+    time but aren't needed until the first query or figure, so deferring them
+    lets a new worker bind its port and answer health checks sooner.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name):
+    """Module proxy for name; `import x.y as z` becomes `z = lazy_import('x.y')`"""
+    return LazyModule(name)
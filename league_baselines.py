@@ -0,0 +1,134 @@
+from lazy_imports import lazy_import
+import logging
+
+sa = lazy_import('sqlalchemy')
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Lookup table written by the post-ingest rollup
+BASELINE_TABLE = 'league_baselines'
+
+# Percentile breakpoints stored for every season/stat pair
+PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+PERCENTILE_COLUMNS = [f'p{p}' for p in PERCENTILES]
+
+# Playing-time column each stat is weighted by
+WEIGHT_COLUMNS = {
+    'batting': 'pa',
+    'pitching': 'innings'
+}
+
+
+def innings_to_decimal(innings):
+    """Convert baseball innings notation (6.1 = 6 1/3) to true innings"""
+    innings = np.asarray(innings, dtype='float64')
+    whole = np.floor(innings)
+    return whole + np.round((innings - whole) * 10) / 3
+
+
+def weighted_season_summary(years, values, weights):
+    """Weighted mean, std and percentile breakpoints of one stat for every season"""
+    years = np.asarray(years, dtype='int64')
+    values = np.asarray(values, dtype='float64')
+    weights = np.asarray(weights, dtype='float64')
+
+    mask = ~np.isnan(values) & ~np.isnan(weights) & (weights > 0)
+    years, values, weights = years[mask], values[mask], weights[mask]
+    if len(years) == 0:
+        return pd.DataFrame(columns=['year', 'n', 'weight', 'mean', 'std'] + PERCENTILE_COLUMNS)
+
+    # Sort by season, then value, so every season is one contiguous sorted run
+    order = np.lexsort((values, years))
+    years, values, weights = years[order], values[order], weights[order]
+    seasons, starts, counts = np.unique(years, return_index=True, return_counts=True)
+
+    weight_sum = np.add.reduceat(weights, starts)
+    mean = np.add.reduceat(weights * values, starts) / weight_sum
+    deviation = values - np.repeat(mean, counts)
+    std = np.sqrt(np.add.reduceat(weights * deviation ** 2, starts) / weight_sum)
+
+    # Weighted midpoint rank of each row within its season, offset by the season
+    # index so a single searchsorted finds the breakpoint for every season at once
+    cumulative = np.cumsum(weights)
+    season_offset = np.repeat(cumulative[starts] - weights[starts], counts)
+    rank = (cumulative - season_offset - 0.5 * weights) / np.repeat(weight_sum, counts)
+    keyed_rank = np.repeat(np.arange(len(seasons)), counts) + rank
+    last_row = starts + counts - 1
+
+    summary = pd.DataFrame({
+        'year': seasons,
+        'n': counts,
+        'weight': weight_sum,
+        'mean': mean,
+        'std': std
+    })
+    for pct, column in zip(PERCENTILES, PERCENTILE_COLUMNS):
+        position = np.searchsorted(keyed_rank, np.arange(len(seasons)) + pct / 100)
+        summary[column] = values[np.minimum(position, last_row)]
+    return summary
+
+
+def compute_league_baselines(stats_df, stat_columns, stat_type):
+    """Build the per-season baseline rows for every stat column in stats_df"""
+    weight_column = WEIGHT_COLUMNS[stat_type]
+    weights = stats_df[weight_column].to_numpy(dtype='float64', na_value=np.nan)
+    if stat_type == 'pitching':
+        weights = innings_to_decimal(weights)
+    years = stats_df['year'].to_numpy(dtype='int64')
+
+    frames = []
+    for stat in stat_columns:
+        if stat not in stats_df.columns:
+            continue
+        values = pd.to_numeric(stats_df[stat], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        summary = weighted_season_summary(years, values, weights)
+        if summary.empty:
+            continue
+        summary.insert(0, 'stat', stat)
+        summary.insert(0, 'stat_type', stat_type)
+        frames.append(summary)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def rebuild_league_baselines(engine, batting_columns, pitching_columns):
+    """Recompute the league baseline table from the raw stats tables"""
+    tables = {
+        'batting': ('batting_stats', batting_columns),
+        'pitching': ('pitching_stats', pitching_columns)
+    }
+    frames = []
+    for stat_type, (table, columns) in tables.items():
+        weight_column = WEIGHT_COLUMNS[stat_type]
+        select_columns = ['year', weight_column] + [c for c in columns if c != weight_column]
+        query = f"SELECT {', '.join(select_columns)} FROM {table} WHERE year IS NOT NULL"
+        stats_df = pd.read_sql(query, engine)
+        logging.info(f"Computing league baselines from {len(stats_df)} {stat_type} rows")
+        frames.append(compute_league_baselines(stats_df, columns, stat_type))
+
+    baselines = pd.concat(frames, ignore_index=True)
+    with engine.begin() as conn:
+        conn.execute(sa.text(f"DELETE FROM {BASELINE_TABLE}"))
+        baselines.to_sql(BASELINE_TABLE, conn, if_exists='append', index=False)
+    logging.info(f"Stored {len(baselines)} league baseline rows")
+    return baselines
+
+
+def percentile_ranks(years, values, baselines):
+    """Map values to league percentile ranks using their season's breakpoints"""
+    years = np.asarray(years)
+    values = np.asarray(values, dtype='float64')
+    ranks = np.full(len(values), np.nan)
+    if baselines is None or baselines.empty:
+        return ranks
+
+    by_year = baselines.set_index('year')[PERCENTILE_COLUMNS]
+    for year in np.unique(years):
+        if year not in by_year.index:
+            continue
+        rows = (years == year) & ~np.isnan(values)
+        breakpoints = by_year.loc[year].to_numpy(dtype='float64')
+        ranks[rows] = np.interp(values[rows], breakpoints, PERCENTILES)
+    return ranks
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -10,6 +10,8 @@ class Player(Base):
     team = Column(String)
     position = Column(String)
     birth_date = Column(Date)
+    # Bumped on every insert and update so name and team edits change the data version
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     # Relationships
     batting_stats = relationship("BattingStats", back_populates="player")
@@ -17,6 +19,10 @@ class Player(Base):
 
 class BattingStats(Base):
     __tablename__ = "batting_stats"
+    __table_args__ = (
+        # Leaderboards filter by season range and a PA qualifier
+        Index("ix_batting_stats_year_pa", "year", "pa"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"), index=True)
@@ -124,6 +130,10 @@ class BattingStats(Base):
 
 class PitchingStats(Base):
     __tablename__ = "pitching_stats"
+    __table_args__ = (
+        # Leaderboards filter by season range and an IP qualifier
+        Index("ix_pitching_stats_year_innings", "year", "innings"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"), index=True)
@@ -209,3 +219,29 @@ class PitchingStats(Base):
     csw_rate = Column(Float)
     barrel_pct = Column(Float)
     hard_hit_pct = Column(Float)
+
+class LeagueBaseline(Base):
+    __tablename__ = "league_baselines"
+    __table_args__ = (
+        Index("ix_league_baselines_lookup", "stat_type", "stat", "year"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    stat_type = Column(String)  # 'batting' or 'pitching'
+    stat = Column(String)
+    year = Column(Integer)
+    
+    # Season summary, weighted by PA (batting) or IP (pitching)
+    n = Column(Integer)
+    weight = Column(Float)
+    mean = Column(Float)
+    std = Column(Float)
+    
+    # Percentile breakpoints
+    p5 = Column(Float)
+    p10 = Column(Float)
+    p25 = Column(Float)
+    p50 = Column(Float)
+    p75 = Column(Float)
+    p90 = Column(Float)
+    p95 = Column(Float)
@@ -0,0 +1,256 @@
+from bisect import bisect_left
+from collections import Counter
+import unicodedata
+import threading
+import logging
+import pickle
+import glob
+import time
+import os
+import re
+
+# Sentinel that sorts after any normalized token character
+PREFIX_END = '\uffff'
+
+# Minimum share of query trigrams a name must contain to count as a typo match
+FUZZY_THRESHOLD = 0.3
+
+# Part of every snapshot file name; bump it when PlayerSearchIndex's attributes
+# change so snapshots pickled by older code are never loaded
+SNAPSHOT_FORMAT = 2
+
+# Seconds before retrying a failed index build, doubling per consecutive failure
+BUILD_RETRY_SECONDS = 5
+BUILD_RETRY_MAX_SECONDS = 300
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation so 'José Ramírez' matches 'jose ramirez'"""
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+    return re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+
+
+def name_trigrams(normalized):
+    """Character trigrams of each word in a normalized name, padded so word edges count"""
+    grams = set()
+    for token in normalized.split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class PlayerSearchIndex:
+    """Prefix and trigram index over player names for incremental search"""
+
+    def __init__(self, players, value_column='player_id', name_column='name', label_column=None):
+        self.values = [str(value) for value in players[value_column]]
+        names = list(players[name_column])
+        if label_column is None:
+            self.labels = names
+        else:
+            self.labels = [f"{name} ({label})" for name, label in zip(names, players[label_column])]
+        self.names = [normalize_name(name) for name in names]
+        self.tokens = [name.split() for name in self.names]
+
+        # Flattened prefix trie: every (token, entry) pair sorted so a prefix
+        # lookup is one contiguous range found with two binary searches
+        pairs = sorted(
+            (token, entry)
+            for entry, tokens in enumerate(self.tokens)
+            for token in set(tokens)
+        )
+        self._prefix_keys = [token for token, _ in pairs]
+        self._prefix_entries = [entry for _, entry in pairs]
+
+        # Trigram postings for the typo-tolerant fallback
+        self._trigram_counts = []
+        self._trigrams = {}
+        for entry, name in enumerate(self.names):
+            grams = name_trigrams(name)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigrams.setdefault(gram, []).append(entry)
+
+    def __len__(self):
+        return len(self.values)
+
+    def search(self, query, limit=20):
+        """Return up to limit (value, label) pairs, best matches first"""
+        query = normalize_name(query)
+        if not query:
+            return [(self.values[i], self.labels[i]) for i in range(min(limit, len(self)))]
+
+        matches = self._prefix_matches(query)
+        if len(matches) < limit and len(query) >= 3:
+            seen = set(matches)
+            matches += [entry for entry in self._fuzzy_matches(query) if entry not in seen]
+        return [(self.values[i], self.labels[i]) for i in matches[:limit]]
+
+    def _prefix_matches(self, query):
+        """Entries where every query token prefixes some name token"""
+        query_tokens = query.split()
+        # The longest token gives the narrowest candidate range
+        anchor = max(query_tokens, key=len)
+        lo = bisect_left(self._prefix_keys, anchor)
+        hi = bisect_left(self._prefix_keys, anchor + PREFIX_END)
+        candidates = set(self._prefix_entries[lo:hi])
+
+        matches = [
+            entry for entry in candidates
+            if all(any(token.startswith(q) for token in self.tokens[entry]) for q in query_tokens)
+        ]
+        # Whole-name prefix hits first, then surname hits, then alphabetical
+        matches.sort(key=lambda entry: (
+            not self.names[entry].startswith(query),
+            not self.tokens[entry][-1].startswith(query_tokens[-1]),
+            entry
+        ))
+        return matches
+
+    def _fuzzy_matches(self, query):
+        """Entries ranked by the share of query trigrams their name contains"""
+        grams = name_trigrams(query)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+
+        scored = []
+        for entry, count in shared.items():
+            similarity = count / len(grams)
+            if similarity >= FUZZY_THRESHOLD:
+                # Among equal scores, prefer names with fewer extra trigrams
+                scored.append((-similarity, self._trigram_counts[entry], entry))
+        scored.sort()
+        return [entry for _, _, entry in scored]
+
+
+class PlayerSearchCache:
+    """Process-wide search index that follows the data version
+
+    The first lookup loads a snapshot for the current version or builds the
+    index; when the version later changes the index is rebuilt on a background
+    thread while the previous one keeps serving searches. After a failed build
+    lookups don't retry for BUILD_RETRY_SECONDS, doubling up to five minutes.
+    """
+
+    def __init__(self, load_players, get_version, snapshot_prefix=None, label_column='years'):
+        self.load_players = load_players
+        self.get_version = get_version
+        self.snapshot_prefix = snapshot_prefix
+        self.label_column = label_column
+        # (version, index), replaced in one assignment so readers never see a mix
+        self._current = (None, None)
+        self._refreshing = False
+        self._failed_builds = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get the current index, starting a background rebuild if the data has moved on"""
+        return self.get_versioned()[1]
+
+    def get_versioned(self):
+        """Get (version, index) as one consistent pair"""
+        version = self.get_version()
+        current = self._current
+        if current[1] is None:
+            with self._lock:
+                current = self._current
+                if current[1] is None:
+                    if self._backing_off() or self._load(version) is None:
+                        # Nothing to serve yet; the next lookup retries
+                        empty = {'player_id': [], 'name': [], self.label_column: []}
+                        return None, PlayerSearchIndex(empty, label_column=self.label_column)
+                    current = self._current
+        elif version != current[0]:
+            self._refresh_in_background(version)
+        return current
+
+    @property
+    def version(self):
+        return self._current[0]
+
+    def _refresh_in_background(self, version):
+        with self._lock:
+            if self._refreshing or self._backing_off():
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, args=(version,), daemon=True).start()
+
+    def _refresh(self, version):
+        try:
+            self._build(version)
+        except Exception as e:
+            logging.error(f"Error refreshing player search index: {str(e)}")
+        finally:
+            self._refreshing = False
+
+    def _load(self, version):
+        index = self._load_snapshot(version)
+        if index is None:
+            index = self._build(version)
+        return index
+
+    def _build(self, version):
+        index = None
+        try:
+            players = self.load_players()
+            if not players.empty:
+                index = PlayerSearchIndex(players.sort_values('name'), label_column=self.label_column)
+                self._current = (version, index)
+                self._save_snapshot(index, version)
+        finally:
+            self._record_build(index is not None)
+        return index
+
+    def _backing_off(self):
+        return time.monotonic() < self._retry_at
+
+    def _record_build(self, succeeded):
+        """Reset the retry delay after a build, or push the next attempt back after a failure"""
+        if succeeded:
+            self._failed_builds = 0
+            self._retry_at = 0.0
+            return
+        self._failed_builds += 1
+        delay = min(BUILD_RETRY_SECONDS * 2 ** (self._failed_builds - 1), BUILD_RETRY_MAX_SECONDS)
+        self._retry_at = time.monotonic() + delay
+
+    def _snapshot_path(self, version):
+        return f"{self.snapshot_prefix}_v{SNAPSHOT_FORMAT}_{version}.pickle"
+
+    def _load_snapshot(self, version):
+        if self.snapshot_prefix is None or version == 'unknown':
+            return None
+        path = self._snapshot_path(version)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                index = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable search snapshot {path}: {str(e)}")
+            return None
+        if not isinstance(index, PlayerSearchIndex):
+            logging.warning(f"Ignoring search snapshot {path} holding a {type(index).__name__}")
+            return None
+        self._current = (version, index)
+        return index
+
+    def _save_snapshot(self, index, version):
+        if self.snapshot_prefix is None or version == 'unknown':
+            return
+        path = self._snapshot_path(version)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            # Older versions and older snapshot formats alike
+            for stale in glob.glob(f"{self.snapshot_prefix}_*.pickle"):
+                if stale != path:
+                    os.remove(stale)
+        except OSError as e:
+            logging.warning(f"Could not write search snapshot {path}: {str(e)}")
@@ -1,3 +1,4 @@
-from app import app
+from shiny import run_app
 
-app.run() 
\ No newline at end of file
+# The app module wraps Shiny in a Starlette router, so run it by import path
+run_app("app:app")
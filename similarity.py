@@ -0,0 +1,267 @@
+from lazy_imports import lazy_import
+import threading
+import logging
+import shutil
+import glob
+import os
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# On-disk cache for the normalized season matrices
+CACHE_DIR = os.getenv(
+    'MLB_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+)
+
+# Seasons below these playing-time floors are too noisy to compare
+MIN_PA = 100
+MIN_INNINGS = 20
+
+# Arrays saved per engine, one .npy file each
+ARRAY_NAMES = ('player_ids', 'years', 'stats', 'zscores', 'values')
+
+# Rows scored per matrix product; bounds the temporary distance matrix
+BLOCK_SIZE = 32768
+
+# Stat subsets whose row norms are kept between queries
+MAX_CACHED_NORMS = 32
+
+# Stats compared when the caller doesn't choose any
+DEFAULT_BATTING_STATS = ['avg', 'obp', 'slg', 'iso', 'bb', 'so', 'hr', 'sb', 'war']
+DEFAULT_PITCHING_STATS = ['era', 'fip', 'whip', 'k_9', 'bb_9', 'hr_9', 'innings', 'war']
+
+
+class SimilarSeasonsEngine:
+    """k-nearest-neighbour search over per-season z-scored stat vectors"""
+
+    def __init__(self, player_ids, years, stats, zscores, values):
+        self.player_ids = np.asarray(player_ids, dtype='int64')
+        self.years = np.asarray(years, dtype='int64')
+        self.stats = list(stats)
+        self.zscores = np.ascontiguousarray(zscores, dtype='float32')
+        self.values = np.asarray(values, dtype='float32')
+        self._stat_positions = {stat: i for i, stat in enumerate(self.stats)}
+        self._rows = {(pid, year): row for row, (pid, year) in enumerate(zip(self.player_ids, self.years))}
+        self._norms = {}
+        self._norm_lock = threading.Lock()
+        # Squared norms over every stat are the common case, so precompute them
+        self._squared_norms(tuple(range(len(self.stats))))
+
+    def __len__(self):
+        return len(self.player_ids)
+
+    @classmethod
+    def build(cls, stats_df, stats):
+        """Z-score every season against its own year and pack into a float32 matrix"""
+        stats = [stat for stat in stats if stat in stats_df.columns]
+        stats_df = stats_df.dropna(subset=['player_id', 'year'])
+        stats_df = stats_df.sort_values(['year', 'player_id'], kind='stable')
+        values = stats_df[stats].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        years = stats_df['year'].to_numpy(dtype='int64')
+
+        _, starts, counts = np.unique(years, return_index=True, return_counts=True)
+        present = ~np.isnan(values)
+        filled = np.where(present, values, 0.0)
+        n = np.maximum(np.add.reduceat(present.astype('float64'), starts, axis=0), 1)
+        mean = np.add.reduceat(filled, starts, axis=0) / n
+        centered = np.where(present, values - np.repeat(mean, counts, axis=0), 0.0)
+        std = np.sqrt(np.add.reduceat(centered ** 2, starts, axis=0) / n)
+        std = np.repeat(std, counts, axis=0)
+
+        # Missing stats and stats with no spread sit at the league average (z = 0)
+        zscores = np.zeros_like(values)
+        np.divide(centered, std, out=zscores, where=std > 0)
+
+        return cls(stats_df['player_id'], years, stats, zscores, values)
+
+    @classmethod
+    def load(cls, path):
+        """Load a saved engine; the big matrices are memory-mapped, so worker
+        processes share one copy through the page cache"""
+        arrays = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r', allow_pickle=False)
+            for name in ARRAY_NAMES
+        }
+        return cls(
+            arrays['player_ids'],
+            arrays['years'],
+            arrays['stats'].tolist(),
+            arrays['zscores'],
+            arrays['values']
+        )
+
+    def save(self, path):
+        """Write one .npy per array into a directory, published with a single rename"""
+        if os.path.isdir(path):
+            # Another worker already built this version
+            return
+        # Write to a temp directory first so readers never see a partial matrix
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        os.makedirs(tmp_path, exist_ok=True)
+        arrays = {
+            'player_ids': self.player_ids,
+            'years': self.years,
+            'stats': np.array(self.stats),
+            'zscores': self.zscores,
+            'values': self.values
+        }
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(tmp_path, f"{name}.npy"), arrays[name], allow_pickle=False)
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Lost a race with another worker publishing the same version
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def seasons_for(self, player_id):
+        """Years available for a player, newest first"""
+        return sorted(self.years[self.player_ids == int(player_id)].tolist(), reverse=True)
+
+    def query(self, player_id, year, stats=None, k=10, exclude_player=True):
+        """Find the k seasons closest to one player-season"""
+        row = self._rows.get((int(player_id), int(year)))
+        if row is None:
+            return pd.DataFrame()
+        columns = self._columns(stats)
+        distances, rows = self.query_rows([row], columns, k, exclude_player=exclude_player)
+        found = rows[0] >= 0
+        rows, distances = rows[0][found], distances[0][found]
+
+        result = pd.DataFrame({
+            'player_id': self.player_ids[rows],
+            'year': self.years[rows],
+            'distance': distances
+        })
+        for position in columns:
+            result[self.stats[position]] = self.values[rows, position]
+        return result
+
+    def query_rows(self, query_rows, columns, k=10, exclude_player=True):
+        """Batched blockwise kNN: returns (distances, rows), each shaped (queries, k)
+
+        k is capped at the most candidates any query has once its excluded rows
+        are removed; a query with fewer candidates than that is padded with
+        row -1 at distance inf.
+        """
+        query_rows = np.asarray(query_rows, dtype='int64')
+        columns = list(columns)
+        queries = self.zscores[np.ix_(query_rows, columns)]
+        query_norms = (queries * queries).sum(axis=1)
+        row_norms = self._squared_norms(tuple(columns))
+
+        # Rows to skip for each query: the query season itself or all of that player's seasons
+        if exclude_player:
+            excluded = [np.flatnonzero(self.player_ids == self.player_ids[row]) for row in query_rows]
+        else:
+            excluded = [np.array([row]) for row in query_rows]
+        k = min(k, len(self) - min((len(rows) for rows in excluded), default=0))
+        if k <= 0:
+            return np.empty((len(query_rows), 0), dtype='float32'), np.empty((len(query_rows), 0), dtype='int64')
+        excluded_query = np.concatenate([np.full(len(rows), i) for i, rows in enumerate(excluded)])
+        excluded_rows = np.concatenate(excluded)
+
+        # Slicing every column keeps each block a view instead of a copy
+        all_columns = columns == list(range(len(self.stats)))
+
+        best_dist = np.empty((len(query_rows), 0), dtype='float32')
+        best_rows = np.empty((len(query_rows), 0), dtype='int64')
+        for start in range(0, len(self), BLOCK_SIZE):
+            end = min(start + BLOCK_SIZE, len(self))
+            block = self.zscores[start:end] if all_columns else self.zscores[start:end, columns]
+            # ||q - x||^2 = ||q||^2 + ||x||^2 - 2 q.x, one matrix product per block
+            dist = query_norms[:, None] + row_norms[None, start:end] - 2 * (queries @ block.T)
+
+            in_block = (excluded_rows >= start) & (excluded_rows < end)
+            dist[excluded_query[in_block], excluded_rows[in_block] - start] = np.inf
+
+            keep = min(k, end - start)
+            top = np.argpartition(dist, keep - 1, axis=1)[:, :keep]
+            best_dist = np.concatenate([best_dist, np.take_along_axis(dist, top, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+            if best_dist.shape[1] > k:
+                top = np.argpartition(best_dist, k - 1, axis=1)[:, :k]
+                best_dist = np.take_along_axis(best_dist, top, axis=1)
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+
+        order = np.argsort(best_dist, axis=1)
+        best_dist = np.take_along_axis(best_dist, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        best_rows[np.isinf(best_dist)] = -1
+        return np.sqrt(np.maximum(best_dist, 0)), best_rows
+
+    def _columns(self, stats):
+        if not stats:
+            return list(range(len(self.stats)))
+        return [self._stat_positions[stat] for stat in stats if stat in self._stat_positions]
+
+    def _squared_norms(self, columns):
+        norms = self._norms.get(columns)
+        if norms is None:
+            subset = self.zscores[:, list(columns)]
+            norms = (subset * subset).sum(axis=1)
+            with self._norm_lock:
+                if len(self._norms) >= MAX_CACHED_NORMS:
+                    self._norms = {tuple(range(len(self.stats))): self._norms[tuple(range(len(self.stats)))]}
+                self._norms[columns] = norms
+        return norms
+
+
+def cache_path(stat_type, version):
+    return os.path.join(CACHE_DIR, f"similarity_{stat_type}_{version}")
+
+
+def load_season_frame(engine, stat_type, stats):
+    """Read the qualifying seasons the engine is built from"""
+    if stat_type == 'pitching':
+        table, qualifier = 'pitching_stats', f"innings >= {MIN_INNINGS}"
+    else:
+        table, qualifier = 'batting_stats', f"pa >= {MIN_PA}"
+    query = f"""
+        SELECT player_id, year, {', '.join(stats)}
+        FROM {table}
+        WHERE {qualifier}
+    """
+    return pd.read_sql(query, engine)
+
+
+def build_engine(engine, stat_type, stats, version):
+    """Build the engine from the database and replace any stale cache files"""
+    engine_obj = SimilarSeasonsEngine.build(load_season_frame(engine, stat_type, stats), stats)
+    path = cache_path(stat_type, version)
+    engine_obj.save(path)
+    for stale in glob.glob(cache_path(stat_type, '*')):
+        if stale != path and not stale.endswith('.tmp'):
+            # Workers that still have the old matrix mapped keep their pages
+            # until they reload; unlinking doesn't pull them out from under them
+            if os.path.isdir(stale):
+                shutil.rmtree(stale, ignore_errors=True)
+            else:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+    logging.info(f"Built {stat_type} similarity matrix: {engine_obj.zscores.shape}")
+    # Serve from the mapped files so this process shares pages with the others
+    try:
+        return SimilarSeasonsEngine.load(path)
+    except Exception:
+        return engine_obj
+
+
+def load_or_build_engine(engine, stat_type, stats, version):
+    """Load the cached engine for this data version, building it if missing"""
+    path = cache_path(stat_type, version)
+    if os.path.isdir(path):
+        try:
+            return SimilarSeasonsEngine.load(path)
+        except Exception as e:
+            logging.warning(f"Ignoring unreadable similarity cache {path}: {str(e)}")
+            shutil.rmtree(path, ignore_errors=True)
+    return build_engine(engine, stat_type, stats, version)
+
+
+def rebuild_similarity_cache(engine, batting_stats, pitching_stats, version):
+    """Rebuild both similarity matrices after an ingest"""
+    build_engine(engine, 'batting', batting_stats, version)
+    build_engine(engine, 'pitching', pitching_stats, version)
@@ -0,0 +1,248 @@
+# Available batting statistics grouped by category
+BATTING_STATS = {
+    'Traditional': {
+        'ab': 'At Bats',
+        'games': 'Games',
+        'pa': 'Plate Appearances',
+        'runs': 'Runs',
+        'hits': 'Hits',
+        'doubles': 'Doubles',
+        'triples': 'Triples',
+        'hr': 'Home Runs',
+        'rbi': 'RBI',
+        'sb': 'Stolen Bases',
+        'cs': 'Caught Stealing',
+        'bb': 'Walks',
+        'ibb': 'Intentional Walks',
+        'so': 'Strikeouts',
+        'hbp': 'Hit By Pitch',
+        'sf': 'Sacrifice Flies',
+        'sh': 'Sacrifice Hits',
+        'gdp': 'Ground Into DP'
+    },
+    'Rate Stats': {
+        'avg': 'Batting Average',
+        'obp': 'On-Base %',
+        'slg': 'Slugging %',
+        'ops': 'OPS',
+        'iso': 'Isolated Power',
+        'babip': 'BABIP',
+        'woba': 'wOBA',
+        'wrc_plus': 'wRC+',
+        'war': 'WAR'
+    },
+    'Plate Discipline': {
+        'o_swing_pct': 'Chase %',
+        'z_swing_pct': 'Zone Swing %',
+        'swing_pct': 'Swing %',
+        'o_contact_pct': 'Outside Contact %',
+        'z_contact_pct': 'Zone Contact %',
+        'contact_pct': 'Contact %',
+        'zone_pct': 'Zone %',
+        'f_strike_pct': 'First Strike %',
+        'swstr_pct': 'Swinging Strike %',
+        'cstr_pct': 'Called Strike %',
+        'csw_pct': 'Called + Swinging Strike %'
+    },
+    'Batted Ball': {
+        'gb_pct': 'Ground Ball %',
+        'fb_pct': 'Fly Ball %',
+        'ld_pct': 'Line Drive %',
+        'iffb_pct': 'Infield Fly Ball %',
+        'hr_fb': 'HR/FB Ratio',
+        'pull_pct': 'Pull %',
+        'cent_pct': 'Center %',
+        'oppo_pct': 'Opposite Field %',
+        'soft_pct': 'Soft Contact %',
+        'med_pct': 'Medium Contact %',
+        'hard_pct': 'Hard Contact %',
+        'exit_velocity': 'Exit Velocity',
+        'launch_angle': 'Launch Angle',
+        'barrel_pct': 'Barrel %',
+        'hard_hit_pct': 'Hard Hit %'
+    },
+    'Value Metrics': {
+        'batting_runs': 'Batting Runs',
+        'baserunning_runs': 'Baserunning Runs',
+        'fielding_runs': 'Fielding Runs',
+        'positional': 'Positional Adjustment',
+        'offense': 'Offensive Runs',
+        'defense': 'Defensive Runs',
+        'replacement': 'Replacement Runs',
+        'rar': 'Runs Above Replacement',
+        'dollars': 'Value in $',
+        'clutch': 'Clutch Score'
+    },
+    'Win Probability': {
+        'wpa': 'Win Probability Added',
+        'neg_wpa': 'Negative WPA',
+        'pos_wpa': 'Positive WPA',
+        're24': 'Run Expectancy 24',
+        'rew': 'Run Expectancy Wins',
+        'pli': 'Leverage Index',
+        'phli': 'PH Leverage Index'
+    },
+    'Pitch Values': {
+        'wfb': 'Fastball Runs',
+        'wsl': 'Slider Runs',
+        'wct': 'Cutter Runs',
+        'wcb': 'Curveball Runs',
+        'wch': 'Changeup Runs'
+    },
+    'Expected Stats': {
+        'xba': 'Expected BA',
+        'xslg': 'Expected SLG',
+        'xwoba': 'Expected wOBA'
+    }
+}
+
+# Available pitching statistics grouped by category
+PITCHING_STATS = {
+    'Traditional': {
+        'innings': 'Innings Pitched',
+        'games': 'Games',
+        'games_started': 'Games Started',
+        'wins': 'Wins',
+        'losses': 'Losses',
+        'saves': 'Saves',
+        'holds': 'Holds',
+        'hits_allowed': 'Hits Allowed',
+        'runs': 'Runs',
+        'earned_runs': 'Earned Runs',
+        'hr_allowed': 'Home Runs',
+        'bb': 'Walks',
+        'ibb': 'Intentional Walks',
+        'so': 'Strikeouts',
+        'hbp': 'Hit By Pitch',
+        'wp': 'Wild Pitches',
+        'bk': 'Balks'
+    },
+    'Rate Stats': {
+        'era': 'ERA',
+        'whip': 'WHIP',
+        'k_9': 'K/9',
+        'bb_9': 'BB/9',
+        'hr_9': 'HR/9',
+        'k_bb': 'K/BB',
+        'k_pct': 'K%',
+        'bb_pct': 'BB%',
+        'fip': 'FIP',
+        'xfip': 'xFIP',
+        'siera': 'SIERA',
+        'war': 'WAR'
+    },
+    'Batted Ball': {
+        'babip': 'BABIP',
+        'lob_pct': 'LOB%',
+        'gb_pct': 'Ground Ball%',
+        'fb_pct': 'Fly Ball%',
+        'ld_pct': 'Line Drive%',
+        'hr_fb': 'HR/FB%',
+        'hard_hit_pct': 'Hard Hit%',
+        'barrel_pct': 'Barrel%'
+    },
+    'Pitch Info': {
+        'avg_velocity': 'Average Velocity',
+        'max_velocity': 'Max Velocity',
+        'spin_rate': 'Spin Rate',
+        'chase_rate': 'Chase Rate',
+        'whiff_pct': 'Whiff%',
+        'csw_rate': 'Called + Swinging Strike%'
+    },
+    'Pitch Mix': {
+        'fa_pct': 'Fastball%',
+        'fc_pct': 'Cutter%',
+        'fs_pct': 'Splitter%',
+        'si_pct': 'Sinker%',
+        'sl_pct': 'Slider%',
+        'cu_pct': 'Curveball%',
+        'ch_pct': 'Changeup%',
+        'kc_pct': 'Knuckle Curve%'
+    },
+    'Win Probability': {
+        'wpa': 'Win Probability Added',
+        'neg_wpa': 'Negative WPA',
+        'pos_wpa': 'Positive WPA',
+        're24': 'Run Expectancy 24',
+        'rew': 'Run Expectancy Wins',
+        'pli': 'Leverage Index',
+        'inli': 'Initial Leverage Index',
+        'clutch': 'Clutch Score'
+    },
+    'Pitch Values': {
+        'wfb': 'Fastball Runs',
+        'wsl': 'Slider Runs',
+        'wct': 'Cutter Runs',
+        'wcb': 'Curveball Runs',
+        'wch': 'Changeup Runs'
+    }
+}
+
+# Batting stats that are averaged rather than summed across seasons
+BATTING_RATE_STATS = {
+    'avg', 'obp', 'slg', 'ops', 'iso', 'babip', 'woba', 'wrc_plus',
+    'o_swing_pct', 'z_swing_pct', 'swing_pct', 'o_contact_pct',
+    'z_contact_pct', 'contact_pct', 'zone_pct', 'f_strike_pct',
+    'swstr_pct', 'cstr_pct', 'csw_pct', 'gb_pct', 'fb_pct',
+    'ld_pct', 'iffb_pct', 'hr_fb', 'pull_pct', 'cent_pct',
+    'oppo_pct', 'soft_pct', 'med_pct', 'hard_pct', 'barrel_pct',
+    'hard_hit_pct', 'exit_velocity', 'launch_angle', 'xba', 'xslg',
+    'xwoba', 'pli', 'phli'
+}
+
+# Pitching stats that are averaged rather than summed across seasons
+PITCHING_RATE_STATS = {
+    'era', 'whip', 'k_9', 'bb_9', 'hr_9', 'k_bb', 'k_pct', 'bb_pct',
+    'fip', 'xfip', 'siera', 'babip', 'lob_pct', 'gb_pct', 'fb_pct',
+    'ld_pct', 'hr_fb', 'hard_hit_pct', 'barrel_pct', 'whiff_pct',
+    'chase_rate', 'csw_rate', 'fa_pct', 'fc_pct', 'fs_pct', 'si_pct',
+    'sl_pct', 'cu_pct', 'ch_pct', 'kc_pct', 'avg_velocity',
+    'max_velocity', 'spin_rate', 'pli', 'inli'
+}
+
+# Decimal places each fractional stat is displayed (and plotted) with;
+# percentages are stored as fractions, so 0.285 shows as 28.5%. Counting
+# stats are whole numbers and aren't listed
+STAT_DECIMALS = {
+    # Slash line and batted ball rates
+    'avg': 3, 'obp': 3, 'slg': 3, 'ops': 3, 'iso': 3, 'babip': 3,
+    'woba': 3, 'xba': 3, 'xslg': 3, 'xwoba': 3, 'hr_fb': 3,
+    # Percentages
+    'o_swing_pct': 3, 'z_swing_pct': 3, 'swing_pct': 3, 'o_contact_pct': 3,
+    'z_contact_pct': 3, 'contact_pct': 3, 'zone_pct': 3, 'f_strike_pct': 3,
+    'swstr_pct': 3, 'cstr_pct': 3, 'csw_pct': 3, 'gb_pct': 3, 'fb_pct': 3,
+    'ld_pct': 3, 'iffb_pct': 3, 'pull_pct': 3, 'cent_pct': 3, 'oppo_pct': 3,
+    'soft_pct': 3, 'med_pct': 3, 'hard_pct': 3, 'barrel_pct': 3,
+    'hard_hit_pct': 3, 'k_pct': 3, 'bb_pct': 3, 'lob_pct': 3, 'whiff_pct': 3,
+    'chase_rate': 3, 'csw_rate': 3, 'fa_pct': 3, 'fc_pct': 3, 'fs_pct': 3,
+    'si_pct': 3, 'sl_pct': 3, 'cu_pct': 3, 'ch_pct': 3, 'kc_pct': 3,
+    # Per-nine and run estimators
+    'era': 2, 'whip': 2, 'k_9': 2, 'bb_9': 2, 'hr_9': 2, 'k_bb': 2,
+    'fip': 2, 'xfip': 2, 'siera': 2,
+    # Win probability and leverage
+    'wpa': 2, 'neg_wpa': 2, 'pos_wpa': 2, 're24': 2, 'rew': 2,
+    'pli': 2, 'phli': 2, 'inli': 2, 'clutch': 2,
+    # Wins, runs and dollar values
+    'war': 1, 'batting_runs': 1, 'baserunning_runs': 1, 'fielding_runs': 1,
+    'positional': 1, 'offense': 1, 'defense': 1, 'replacement': 1,
+    'rar': 1, 'dollars': 1, 'wfb': 1, 'wsl': 1, 'wct': 1, 'wcb': 1, 'wch': 1,
+    # Innings keep their thirds (180.1 is 180 1/3)
+    'innings': 1,
+    # Statcast measurements
+    'exit_velocity': 1, 'launch_angle': 1, 'avg_velocity': 1, 'max_velocity': 1,
+    'spin_rate': 0,
+    # Indexed to league average = 100
+    'wrc_plus': 0
+}
+
+def stat_columns(stat_groups):
+    """Flatten a grouped stat dict into an ordered list of column names"""
+    return list(dict.fromkeys(
+        column for group in stat_groups.values() for column in group
+    ))
+
+def stat_labels(stat_groups):
+    """Flatten a grouped stat dict into a column -> display label mapping"""
+    return {
+        column: label for group in stat_groups.values() for column, label in group.items()
+    }
@@ -0,0 +1,86 @@
+import pickle
+import sqlite3
+import sys
+
+import pytest
+
+import cache
+from cache import SQLiteCache
+
+
+class Moved:
+    """Stands in for a class renamed or removed after its instances were cached"""
+
+
+@pytest.fixture
+def shared(tmp_path):
+    return SQLiteCache(str(tmp_path / 'shared.db'), 'figures')
+
+
+def stored_keys(cache):
+    with sqlite3.connect(cache.path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def overwrite_value(cache, blob):
+    with sqlite3.connect(cache.path) as conn:
+        conn.execute("UPDATE cache SET value = ?", (blob,))
+
+
+def test_round_trip_counts_hits_and_misses(shared):
+    shared.set(('batting', 2024), {'json': '{}'})
+    assert shared.get(('batting', 2024)) == {'json': '{}'}
+    assert shared.get(('batting', 2023), 'missing') == 'missing'
+    assert (shared.hits, shared.misses) == (1, 1)
+
+
+@pytest.mark.parametrize('blob', [b'not a pickle', pickle.dumps({'json': '{}'})[:-3]], ids=['garbage', 'truncated'])
+def test_corrupt_entries_are_misses_and_deleted(shared, blob):
+    shared.set('key', {'json': '{}'})
+    overwrite_value(shared, blob)
+    assert shared.get('key', 'missing') == 'missing'
+    assert shared.misses == 1
+    assert stored_keys(shared) == 0
+
+
+def test_entries_of_classes_that_no_longer_exist_are_misses_and_deleted(shared, monkeypatch):
+    shared.set('key', Moved())
+    monkeypatch.delattr(sys.modules[Moved.__module__], 'Moved')
+    assert shared.get('key') is None
+    assert shared.misses == 1
+    assert stored_keys(shared) == 0
+
+    shared.set('key', 1)
+    assert shared.get('key') == 1
+
+
+@pytest.fixture
+def shared_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'shared.db')
+    monkeypatch.setattr(cache, 'SHARED_CACHE_PATH', path)
+    return path
+
+
+def test_claim_goes_to_the_first_process_and_stays_with_it(shared_path, monkeypatch):
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 101)
+    assert cache.claim('warm:v1')
+    assert cache.claim('warm:v1')
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 202)
+    assert not cache.claim('warm:v1')
+    assert cache.claim('warm:v2')
+
+
+def test_stale_claims_can_be_taken_over(shared_path, monkeypatch):
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 101)
+    assert cache.claim('warm:v1')
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 202)
+    assert not cache.claim('warm:v1', ttl=60)
+    assert cache.claim('warm:v1', ttl=0)
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 101)
+    assert not cache.claim('warm:v1', ttl=60)
+
+
+def test_claim_without_a_shared_cache_always_succeeds(monkeypatch):
+    monkeypatch.setattr(cache, 'SHARED_CACHE_PATH', None)
+    assert cache.claim('warm:v1')
+    assert cache.claim('warm:v1')
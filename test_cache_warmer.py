@@ -0,0 +1,85 @@
+import pytest
+
+import cache
+import cache_warmer
+from cache_warmer import CacheWarmer
+
+
+class FakeData:
+    def __init__(self, version='v1'):
+        self.version = version
+        self.leaderboards = []
+
+    def get_data_version(self):
+        return self.version
+
+    def get_career_index(self, is_pitching=False):
+        return None
+
+    def career_index_version(self, is_pitching=False):
+        return self.version
+
+    def get_leaderboard(self, **kwargs):
+        self.leaderboards.append(kwargs)
+
+
+class FakeViz:
+    def __init__(self):
+        self.rendered = []
+
+    def get_plot_json(self, **request):
+        self.rendered.append(request)
+
+    def figure_key(self, **request):
+        return (tuple(request['player_ids']), request['x_stat'], request['y_stat'], request['plot_type'])
+
+
+def make_warmer(data):
+    return CacheWarmer(
+        data,
+        FakeViz(),
+        views={'batting': [('hr', 'avg', 'line'), ('hr', 'avg', 'league')]},
+        default_years=(2020, 2024),
+        leaderboards=[dict(stat='war', start_year=2020, end_year=2024)],
+        player_count=0
+    )
+
+
+@pytest.fixture(autouse=True)
+def popular_players(monkeypatch):
+    monkeypatch.setitem(cache_warmer.WARM_PLAYERS, 'batting', '1,2')
+
+
+def test_only_the_claiming_worker_renders_a_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, 'SHARED_CACHE_PATH', str(tmp_path / 'shared.db'))
+    data = FakeData()
+    first, second = make_warmer(data), make_warmer(data)
+
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 101)
+    first.warm()
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 202)
+    second.warm()
+
+    assert len(first.viz.rendered) == 3
+    assert second.viz.rendered == []
+    assert len(data.leaderboards) == 1
+    # Both count requests for the warmed figures as warm
+    assert first.stats()['warm_figures'] == second.stats()['warm_figures'] == 3
+    assert first.version == second.version == 'v1'
+
+    # The next version goes to whichever worker claims it first
+    data.version = 'v2'
+    second.warm()
+    monkeypatch.setattr(cache.os, 'getpid', lambda: 101)
+    first.warm()
+    assert len(second.viz.rendered) == 3
+    assert len(first.viz.rendered) == 3
+
+
+def test_every_worker_renders_without_a_shared_cache(monkeypatch):
+    monkeypatch.setattr(cache, 'SHARED_CACHE_PATH', None)
+    data = FakeData()
+    first, second = make_warmer(data), make_warmer(data)
+    first.warm()
+    second.warm()
+    assert len(first.viz.rendered) == len(second.viz.rendered) == 3
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from career_index import CareerIndex, BATTING_RATE_FORMULAS, PITCHING_RATE_FORMULAS
+
+COUNT_COLUMNS = ['pa', 'ab', 'hits', 'doubles', 'triples', 'hr', 'bb', 'hbp', 'sf', 'so']
+
+RANGES = [(2000, 2010), (2003, 2003), (2002, 2006), (1990, 1999), (2008, 2030)]
+
+
+@pytest.fixture
+def seasons():
+    """Seasons for four players with gaps in their careers and some missing rates"""
+    rng = np.random.default_rng(7)
+    rows = []
+    for player_id in range(1, 5):
+        for year in sorted(rng.choice(np.arange(2000, 2011), size=7, replace=False)):
+            row = {'player_id': player_id, 'year': int(year)}
+            for column in COUNT_COLUMNS:
+                row[column] = int(rng.integers(0, 40))
+            row['ab'] = row['hits'] + int(rng.integers(50, 400))
+            row['pa'] = row['ab'] + row['bb']
+            # Eighths are exact in float32, so the brute force needs no tolerance for storage
+            row['woba'] = np.nan if rng.random() < 0.2 else rng.integers(0, 8) / 8
+            rows.append(row)
+    # Shuffled, so the index has to sort by player and year itself
+    return pd.DataFrame(rows).sample(frac=1, random_state=3).reset_index(drop=True)
+
+
+@pytest.fixture
+def index(seasons):
+    return CareerIndex(seasons, rate_stats={'woba'}, weight_column='pa', rate_formulas=BATTING_RATE_FORMULAS)
+
+
+def brute_force(seasons, player_id, start_year, end_year):
+    rows = seasons[(seasons['player_id'] == player_id) & seasons['year'].between(start_year, end_year)]
+    totals = rows[COUNT_COLUMNS].sum()
+    expected = {column: float(totals[column]) for column in COUNT_COLUMNS}
+
+    def ratio(top, bottom):
+        return top / bottom if bottom > 0 else np.nan
+
+    expected['avg'] = ratio(totals['hits'], totals['ab'])
+    expected['obp'] = ratio(totals['hits'] + totals['bb'] + totals['hbp'],
+                            totals['ab'] + totals['bb'] + totals['hbp'] + totals['sf'])
+    expected['slg'] = ratio(totals['hits'] + totals['doubles'] + 2 * totals['triples'] + 3 * totals['hr'], totals['ab'])
+    expected['ops'] = expected['obp'] + expected['slg']
+    rated = rows[rows['woba'].notna()]
+    expected['woba'] = ratio((rated['woba'] * rated['pa']).sum(), rated['pa'].sum())
+    return expected
+
+
+@pytest.mark.parametrize('stat', COUNT_COLUMNS + ['avg', 'obp', 'slg', 'ops', 'woba'])
+def test_value_matches_brute_force(seasons, index, stat):
+    player_ids = [player_id for player_id in range(1, 6) for _ in RANGES]
+    starts = [start for _ in range(1, 6) for start, _ in RANGES]
+    ends = [end for _ in range(1, 6) for _, end in RANGES]
+    expected = [brute_force(seasons, *query)[stat] for query in zip(player_ids, starts, ends)]
+    np.testing.assert_allclose(index.value(stat, player_ids, starts, ends), expected, rtol=1e-9)
+
+
+def test_total_of_unknown_player_is_zero(index):
+    assert index.total('hr', [99], 2000, 2010).tolist() == [0.0]
+    assert np.isnan(index.value('avg', [99], 2000, 2010)[0])
+
+
+def test_supports(index):
+    assert index.supports('ops')
+    assert index.supports('woba')
+    assert not index.supports('xwoba')
+
+
+def test_pitching_innings_are_summed_as_thirds():
+    seasons = pd.DataFrame({
+        'player_id': [1, 1, 1],
+        'year': [2001, 2002, 2003],
+        'innings': [6.1, 10.2, 3.0],
+        'earned_runs': [2, 5, 1]
+    })
+    index = CareerIndex(seasons, rate_stats=set(), weight_column='innings',
+                        rate_formulas=PITCHING_RATE_FORMULAS, is_pitching=True)
+    innings = 6 + 1 / 3 + 10 + 2 / 3 + 3
+    np.testing.assert_allclose(index.total('innings', [1], 2001, 2003), [innings])
+    np.testing.assert_allclose(index.value('era', [1], 2001, 2003), [9 * 8 / innings])
@@ -0,0 +1,152 @@
+import datetime
+import os
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm.exc import StaleDataError
+
+# database.py reads DATABASE_URL through config at import; these tests use their own engine
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from . import crud, models
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine('sqlite://')
+    models.Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    """(first keyword, executemany row count) of every statement sent to the database"""
+    sent = []
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def record(conn, cursor, statement, parameters, context, executemany):
+        sent.append((statement.split()[0], len(parameters) if executemany else 1))
+
+    return sent
+
+
+def make_players(db, count):
+    return crud.create_players(db, [
+        {'name': f"Player {i}", 'team': 'AAA', 'position': 'C', 'birth_date': datetime.date(1990, 1, i + 1)}
+        for i in range(count)
+    ])
+
+
+def test_create_players_returns_players_in_input_order(db):
+    players = make_players(db, 5)
+    assert [player.name for player in players] == [f"Player {i}" for i in range(5)]
+    assert [player.id for player in players] == sorted(player.id for player in players)
+    assert db.query(models.Player).count() == 5
+
+
+def test_create_players_reloads_in_one_query(db, statements):
+    make_players(db, 5)
+    assert [keyword for keyword, _ in statements].count('SELECT') == 1
+
+
+def test_create_players_empty(db, statements):
+    assert crud.create_players(db, []) == []
+    assert statements == []
+
+
+def test_update_players_groups_rows_by_columns(db, statements):
+    players = make_players(db, 3)
+    statements.clear()
+    updated = crud.update_players(db, [
+        {'id': players[0].id, 'name': 'Renamed 0'},
+        {'id': players[1].id, 'team': 'BBB'},
+        {'id': players[2].id, 'name': 'Renamed 2'}
+    ])
+    updates = [rows for keyword, rows in statements if keyword == 'UPDATE']
+    assert sorted(updates) == [1, 2]
+    assert [(player.name, player.team) for player in updated] == [
+        ('Renamed 0', 'AAA'), ('Player 1', 'BBB'), ('Renamed 2', 'AAA')
+    ]
+
+
+def test_update_players_unknown_id_commits_nothing(db):
+    players = make_players(db, 1)
+    with pytest.raises(StaleDataError):
+        crud.update_players(db, [{'id': players[0].id, 'team': 'BBB'}, {'id': 999, 'team': 'BBB'}])
+    db.rollback()
+    assert crud.get_player(db, players[0].id).team == 'AAA'
+
+
+def test_upsert_players_inserts_and_updates_given_columns(db):
+    players = make_players(db, 2)
+    result = crud.upsert_players(db, [
+        {'id': players[0].id, 'team': 'BBB'},
+        {'id': 100, 'name': 'New player', 'team': 'CCC'}
+    ])
+    assert [(player.id, player.name, player.team) for player in result] == [
+        (players[0].id, 'Player 0', 'BBB'), (100, 'New player', 'CCC')
+    ]
+    assert db.query(models.Player).count() == 3
+
+
+def test_upsert_players_id_only_leaves_existing_rows(db):
+    players = make_players(db, 1)
+    result = crud.upsert_players(db, [{'id': players[0].id}])
+    assert [(player.name, player.team) for player in result] == [('Player 0', 'AAA')]
+
+
+def test_upsert_players_unsupported_dialect(db, monkeypatch):
+    monkeypatch.delitem(crud.UPSERT_INSERTS, 'sqlite')
+    with pytest.raises(NotImplementedError):
+        crud.upsert_players(db, [{'id': 1, 'name': 'Anyone'}])
+
+
+def test_delete_players_returns_deleted_rows(db, statements):
+    players = make_players(db, 3)
+    statements.clear()
+    deleted = crud.delete_players(db, [players[0].id, players[2].id, 999])
+    assert sorted(row.name for row in deleted) == ['Player 0', 'Player 2']
+    assert [keyword for keyword, _ in statements] == ['DELETE']
+    assert [player.id for player in crud.get_players(db)] == [players[1].id]
+
+
+def test_get_players_after_pages_cover_every_id_once(db):
+    ids = [player.id for player in make_players(db, 23)]
+    pages, after_id = [], None
+    while True:
+        page = crud.get_players_after(db, after_id=after_id, limit=10)
+        if not page:
+            break
+        pages.append([player.id for player in page])
+        after_id = page[-1].id
+    assert [len(page) for page in pages] == [10, 10, 3]
+    assert [player_id for page in pages for player_id in page] == ids
+
+
+def test_iter_stats_filters_on_year_zero(db):
+    player = make_players(db, 1)[0]
+    for model in (models.BattingStats, models.PitchingStats):
+        db.add_all([model(player_id=player.id, year=year) for year in (0, 2023, 2024)])
+    db.commit()
+    assert [row.year for row in crud.iter_batting_stats(db, year=0)] == [0]
+    assert [row.year for row in crud.iter_pitching_stats(db, player_id=player.id, year=0)] == [0]
+    assert [row.year for row in crud.iter_batting_stats(db, player_id=player.id)] == [0, 2023, 2024]
+
+
+def test_iter_players_loads_batch_size_rows_at_a_time(db):
+    ids = [player.id for player in make_players(db, 25)]
+    db.expunge_all()
+    players = crud.iter_players(db, batch_size=10)
+    first = next(players)
+    assert len(db.identity_map) == 10
+    rest = list(players)
+    assert [player.id for player in [first] + rest] == ids
+    assert len(db.identity_map) == 25
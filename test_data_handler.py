@@ -0,0 +1,45 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from . import models
+from data_handler import LOWER_IS_BETTER, MLBDataHandler
+
+
+@pytest.fixture
+def handler(tmp_path):
+    """Data handler over a SQLite database holding three players' 2020 seasons"""
+    url = f"sqlite:///{tmp_path / 'stats.db'}"
+    engine = create_engine(url)
+    models.Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for player_id, (csw_pct, avg, era, so) in enumerate(
+        [(0.31, 0.250, 4.10, 150), (0.26, 0.310, 2.95, 210), (0.35, 0.199, 5.40, 90)], start=1
+    ):
+        session.add(models.Player(id=player_id, name=f'Player {player_id}'))
+        session.add(models.BattingStats(player_id=player_id, year=2020, pa=500, csw_pct=csw_pct, avg=avg))
+        session.add(models.PitchingStats(player_id=player_id, year=2020, innings=150, era=era, so=so))
+    session.commit()
+    session.close()
+    engine.dispose()
+    return MLBDataHandler(url)
+
+
+@pytest.mark.parametrize('stat, is_pitching, expected', [
+    # Called plus swinging strikes are the pitcher winning, so the batting board ranks them ascending
+    ('csw_pct', False, [2, 1, 3]),
+    ('avg', False, [2, 1, 3]),
+    ('era', True, [2, 1, 3]),
+    ('so', True, [2, 1, 3]),
+])
+def test_leaderboard_ranks_the_best_value_first(handler, stat, is_pitching, expected):
+    leaderboard = handler.get_leaderboard(stat, 2020, 2020, is_pitching=is_pitching)
+    assert leaderboard['player_id'].tolist() == expected
+
+
+def test_plate_discipline_stats_that_favour_the_pitcher_rank_ascending():
+    assert {'cstr_pct', 'csw_pct', 'iffb_pct'} <= LOWER_IS_BETTER['batting']
@@ -0,0 +1,92 @@
+import copy
+import json
+
+import pytest
+
+from figure_patch import FigureStream, figure_patch, merge_patch
+
+
+def apply_merge_patch(target, patch):
+    """RFC 7396 section 2 MergePatch, as written in the RFC"""
+    if not isinstance(patch, dict):
+        return patch
+    if not isinstance(target, dict):
+        target = {}
+    target = copy.deepcopy(target)
+    for key, value in patch.items():
+        if value is None:
+            target.pop(key, None)
+        else:
+            target[key] = apply_merge_patch(target.get(key), value)
+    return target
+
+
+CASES = [
+    ({}, {}),
+    ({'a': 1}, {'a': 1}),
+    ({'a': 1}, {'a': 2}),
+    ({'a': 1, 'b': 2}, {'b': 2}),
+    ({'a': {'b': 1, 'c': 2}}, {'a': {'b': 1, 'c': 3, 'd': [1, 2]}}),
+    ({'a': {'b': 1}}, {'a': 5}),
+    ({'a': 5}, {'a': {'b': 1}}),
+    ({'a': [1, 2, 3]}, {'a': [1, 2]}),
+    ({'a': [{'x': 1}]}, {'a': [{'x': 2}]}),
+    ({'a': {'b': {'c': {'d': 1}}}, 'e': 'f'}, {'a': {'b': {'c': {}}}, 'g': False})
+]
+
+
+@pytest.mark.parametrize('previous, current', CASES)
+def test_merge_patch_round_trips(previous, current):
+    patch = merge_patch(previous, current)
+    assert apply_merge_patch(previous, patch) == current
+
+
+def test_merge_patch_sends_only_changes():
+    previous = {'layout': {'title': 'HR', 'width': 800}, 'keep': [1, 2, 3]}
+    current = {'layout': {'title': 'RBI', 'width': 800}, 'keep': [1, 2, 3]}
+    assert merge_patch(previous, current) == {'layout': {'title': 'RBI'}}
+
+
+def test_merge_patch_does_not_modify_inputs():
+    previous, current = {'a': {'b': 1}}, {'a': {'b': 2}}
+    merge_patch(previous, current)
+    assert previous == {'a': {'b': 1}} and current == {'a': {'b': 2}}
+
+
+def test_figure_patch_applies_per_trace():
+    previous = {
+        'data': [{'x': [1, 2], 'name': 'A'}, {'x': [3], 'name': 'B'}],
+        'layout': {'xaxis': {'title': {'text': 'HR'}}}
+    }
+    current = {
+        'data': [{'x': [1, 2], 'name': 'A', 'mode': 'lines'}, {'x': [4], 'name': 'B'}, {'x': [5], 'name': 'C'}],
+        'layout': {'xaxis': {'title': {'text': 'RBI'}}}
+    }
+    patch = figure_patch(previous, current)
+    assert apply_merge_patch(previous['layout'], patch['layout']) == current['layout']
+    rebuilt = [
+        apply_merge_patch(previous['data'][i] if i < len(previous['data']) else {}, trace_patch)
+        for i, trace_patch in enumerate(patch['data'])
+    ]
+    assert rebuilt == current['data']
+
+
+def test_figure_stream_sends_full_figure_then_patches():
+    stream = FigureStream()
+    figure = {'data': [{'x': list(range(200)), 'y': list(range(200))}], 'layout': {'title': {'text': 'HR'}}}
+    first = stream.update(json.dumps(figure))
+    assert json.loads(first['figure']) == figure
+
+    figure['layout']['title']['text'] = 'RBI'
+    second = stream.update(json.dumps(figure))
+    assert second == {'patch': {'layout': {'title': {'text': 'RBI'}}, 'data': [{}]}}
+
+    assert stream.update(None) == {'figure': None}
+    assert 'figure' in stream.update(json.dumps(figure))
+
+
+def test_figure_stream_sends_full_figure_when_patch_is_larger():
+    stream = FigureStream()
+    stream.update(json.dumps({'data': [{'x': [1]}], 'layout': {}}))
+    replacement = json.dumps({'data': [{'y': [2]}], 'layout': {}})
+    assert stream.update(replacement) == {'figure': replacement}
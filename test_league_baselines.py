@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from league_baselines import PERCENTILES, innings_to_decimal, percentile_ranks, weighted_season_summary
+
+
+def brute_force(values, weights):
+    """Weighted mean, std and midpoint-rank percentiles of one season"""
+    order = np.argsort(values, kind='stable')
+    values, weights = values[order], weights[order]
+    total = weights.sum()
+    mean = (weights * values).sum() / total
+    std = np.sqrt((weights * (values - mean) ** 2).sum() / total)
+    ranks = (np.cumsum(weights) - 0.5 * weights) / total
+    percentiles = []
+    for pct in PERCENTILES:
+        at_or_above = np.flatnonzero(ranks >= pct / 100)
+        percentiles.append(values[at_or_above[0]] if len(at_or_above) else values[-1])
+    return len(values), total, mean, std, percentiles
+
+
+@pytest.fixture
+def season_rows():
+    rng = np.random.default_rng(11)
+    size = 400
+    years = rng.integers(2000, 2006, size)
+    values = rng.normal(0.3, 0.05, size)
+    weights = rng.integers(0, 700, size).astype('float64')
+    values[rng.random(size) < 0.05] = np.nan
+    weights[rng.random(size) < 0.05] = np.nan
+    return years, values, weights
+
+
+def test_summary_matches_brute_force(season_rows):
+    years, values, weights = season_rows
+    summary = weighted_season_summary(years, values, weights)
+    assert summary['year'].tolist() == sorted(set(years.tolist()))
+    for row in summary.itertuples():
+        usable = (years == row.year) & ~np.isnan(values) & ~np.isnan(weights) & (weights > 0)
+        n, total, mean, std, percentiles = brute_force(values[usable], weights[usable])
+        assert row.n == n
+        assert row.weight == pytest.approx(total)
+        assert row.mean == pytest.approx(mean)
+        assert row.std == pytest.approx(std)
+        assert [getattr(row, f'p{pct}') for pct in PERCENTILES] == pytest.approx(percentiles)
+
+
+def test_summary_of_single_season_value():
+    summary = weighted_season_summary([2001, 2001], [0.250, np.nan], [100, 200])
+    assert summary['n'].tolist() == [1]
+    assert summary['std'].tolist() == [0.0]
+    assert summary[[f'p{pct}' for pct in PERCENTILES]].iloc[0].tolist() == [0.25] * len(PERCENTILES)
+
+
+def test_summary_without_usable_rows_is_empty():
+    assert weighted_season_summary([2001], [np.nan], [100]).empty
+
+
+def test_innings_to_decimal():
+    np.testing.assert_allclose(innings_to_decimal([6.0, 6.1, 6.2, 200.2]), [6, 6 + 1 / 3, 6 + 2 / 3, 200 + 2 / 3])
+
+
+def test_percentile_ranks_interpolate_within_the_season(season_rows):
+    years, values, weights = season_rows
+    summary = weighted_season_summary(years, values, weights)
+    breakpoints = summary.set_index('year').loc[2002, [f'p{pct}' for pct in PERCENTILES]].to_numpy()
+    ranks = percentile_ranks([2002, 2002, 1999], [breakpoints[3], breakpoints[0], 0.3], summary)
+    assert ranks[0] == pytest.approx(50)
+    assert ranks[1] == pytest.approx(5)
+    assert np.isnan(ranks[2])
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+import app
+import cache
+
+
+def family_lines(text):
+    """Line numbers of each metric family's HELP, TYPE and sample lines, in order"""
+    families, types = {}, {}
+    for number, line in enumerate(text.splitlines()):
+        if line.startswith('# '):
+            _, kind, name, rest = line.split(' ', 3)
+            if kind == 'TYPE':
+                types[name] = rest
+        else:
+            name = line.split('{', 1)[0].split(' ', 1)[0]
+            for suffix in ('_bucket', '_sum', '_count'):
+                if name.endswith(suffix) and types.get(name[:-len(suffix)]) == 'histogram':
+                    name = name[:-len(suffix)]
+            assert name in types, f'sample before its header: {line}'
+        families.setdefault(name, []).append(number)
+    return families
+
+
+@pytest.fixture
+def metrics_text(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, '_caches', {})
+    monkeypatch.setattr(cache, 'SHARED_CACHE_PATH', str(tmp_path / 'shared.db'))
+    for namespace in ('figures', 'leaderboards'):
+        figures = cache.make_cache(namespace)
+        figures.set('a', b'1')
+        figures.get('a')
+        figures.get('b')
+    stats = app.db_handler.query_stats
+    stats.record('get_player_stats', 'SELECT 1', None, 0.01, rows=3, nbytes=100)
+    stats.record('get_leaderboard', 'SELECT 2', None, 0.2, error='boom')
+    for stage in ('query', 'build', 'total'):
+        with app.viz_handler.render_stats.span('batting_plot', 'Line', stage):
+            pass
+    try:
+        return app.metrics(None).body.decode()
+    finally:
+        stats.reset()
+        app.viz_handler.render_stats.reset()
+
+
+def test_every_family_has_its_samples_right_after_its_header(metrics_text):
+    families = family_lines(metrics_text)
+    for name in ('mlb_query_calls_total', 'mlb_query_latency_ms', 'mlb_render_stage_ms',
+                 'mlb_render_stage_errors_total', 'mlb_cache_lookups_total', 'mlb_cache_hit_ratio'):
+        assert len(families[name]) > 2, name
+    for name, numbers in families.items():
+        assert numbers == list(range(numbers[0], numbers[0] + len(numbers))), f'{name} is split up'
+
+
+def test_each_family_is_declared_once(metrics_text):
+    names = [line.split(' ')[2] for line in metrics_text.splitlines() if line.startswith('# TYPE ')]
+    assert len(names) == len(set(names))
+
+
+def test_cache_lookups_cover_both_tiers(metrics_text):
+    lines = [line for line in metrics_text.splitlines() if line.startswith('mlb_cache_lookups_total{')]
+    assert sum('tier="local"' in line for line in lines) == 4
+    assert sum('tier="shared"' in line for line in lines) == 4
@@ -0,0 +1,114 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+import player_search
+from player_search import BUILD_RETRY_SECONDS, PlayerSearchCache, PlayerSearchIndex
+
+PLAYERS = pd.DataFrame({
+    'player_id': [1, 2],
+    'name': ['Jose Ramirez', 'Aaron Judge'],
+    'years': ['2013-2024', '2016-2024']
+})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class InlineThread:
+    """Runs the background refresh on start(), so tests see it finish"""
+
+    def __init__(self, target, args, daemon):
+        self.target = target
+        self.args = args
+
+    def start(self):
+        self.target(*self.args)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(player_search.time, 'monotonic', clock)
+    return clock
+
+
+def test_failed_builds_back_off_before_retrying(clock):
+    loads = []
+
+    def load_players():
+        loads.append(clock.now)
+        return pd.DataFrame() if len(loads) < 3 else PLAYERS
+
+    cache = PlayerSearchCache(load_players, lambda: 'v1')
+    assert len(cache.get()) == 0
+    assert len(cache.get()) == 0
+    assert len(loads) == 1
+
+    clock.now += BUILD_RETRY_SECONDS
+    assert len(cache.get()) == 0
+    assert len(loads) == 2
+
+    # The second failure doubles the wait
+    clock.now += BUILD_RETRY_SECONDS
+    assert len(cache.get()) == 0
+    assert len(loads) == 2
+    clock.now += BUILD_RETRY_SECONDS
+    assert len(cache.get()) == 2
+    assert loads == [1000.0, 1005.0, 1015.0]
+
+
+def test_background_refresh_backs_off_after_a_failure(clock, monkeypatch):
+    monkeypatch.setattr(player_search.threading, 'Thread', InlineThread)
+    version = ['v1']
+    loads = []
+
+    def load_players():
+        loads.append(version[0])
+        return PLAYERS if version[0] == 'v1' else pd.DataFrame()
+
+    cache = PlayerSearchCache(load_players, lambda: version[0])
+    assert len(cache.get()) == 2
+
+    version[0] = 'v2'
+    for _ in range(3):
+        # The failed rebuild leaves the v1 index serving searches
+        assert len(cache.get()) == 2
+    assert loads == ['v1', 'v2']
+    clock.now += BUILD_RETRY_SECONDS
+    cache.get()
+    assert loads == ['v1', 'v2', 'v2']
+
+
+def test_unreadable_and_foreign_snapshots_are_rebuilt(tmp_path):
+    prefix = str(tmp_path / 'player_search_batting')
+    cache = PlayerSearchCache(lambda: PLAYERS, lambda: 'v1', snapshot_prefix=prefix)
+    path = cache._snapshot_path('v1')
+    assert f"_v{player_search.SNAPSHOT_FORMAT}_" in path
+
+    with open(path, 'wb') as f:
+        f.write(b'not a pickle')
+    assert cache.get().search('judge') == [('2', 'Aaron Judge (2016-2024)')]
+
+    with open(path, 'wb') as f:
+        pickle.dump({'values': []}, f)
+    cache = PlayerSearchCache(lambda: PLAYERS, lambda: 'v1', snapshot_prefix=prefix)
+    assert len(cache.get()) == 2
+
+
+def test_snapshots_from_an_older_format_are_ignored_and_removed(tmp_path):
+    prefix = str(tmp_path / 'player_search_batting')
+    old = f"{prefix}_v1.pickle"
+    with open(old, 'wb') as f:
+        pickle.dump(PlayerSearchIndex(PLAYERS.iloc[:1], label_column='years'), f)
+
+    cache = PlayerSearchCache(lambda: PLAYERS, lambda: 'v1', snapshot_prefix=prefix)
+    assert len(cache.get()) == 2
+    assert not (tmp_path / 'player_search_batting_v1.pickle').exists()
+    assert (tmp_path / f"player_search_batting_v{player_search.SNAPSHOT_FORMAT}_v1.pickle").exists()
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+import similarity
+from similarity import SimilarSeasonsEngine
+
+STATS = ['a', 'b', 'c', 'd']
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # Small blocks so queries merge candidates across several blocks
+    monkeypatch.setattr(similarity, 'BLOCK_SIZE', 7)
+    rng = np.random.default_rng(5)
+    players = np.repeat(np.arange(1, 11), 5)
+    years = np.tile(np.arange(2000, 2005), 10)
+    zscores = rng.normal(size=(len(players), len(STATS)))
+    return SimilarSeasonsEngine(players, years, STATS, zscores, zscores * 10)
+
+
+def brute_force(engine, row, columns, k, exclude_player):
+    zscores = engine.zscores.astype('float64')[:, columns]
+    distances = np.sqrt(((zscores - zscores[row]) ** 2).sum(axis=1))
+    if exclude_player:
+        candidates = np.flatnonzero(engine.player_ids != engine.player_ids[row])
+    else:
+        candidates = np.flatnonzero(np.arange(len(engine)) != row)
+    nearest = candidates[np.argsort(distances[candidates], kind='stable')[:k]]
+    return distances[nearest], nearest
+
+
+@pytest.mark.parametrize('columns', [[0, 1, 2, 3], [1, 3]])
+@pytest.mark.parametrize('exclude_player', [True, False])
+@pytest.mark.parametrize('k', [1, 5, 12])
+def test_query_rows_matches_brute_force(engine, columns, exclude_player, k):
+    query_rows = [0, 17, 49]
+    distances, rows = engine.query_rows(query_rows, columns, k, exclude_player=exclude_player)
+    assert rows.shape == (len(query_rows), k)
+    for i, row in enumerate(query_rows):
+        expected_distances, expected_rows = brute_force(engine, row, columns, k, exclude_player)
+        assert rows[i].tolist() == expected_rows.tolist()
+        np.testing.assert_allclose(distances[i], expected_distances, rtol=1e-4, atol=1e-5)
+
+
+def test_k_beyond_candidates_returns_only_candidates(engine):
+    # Excluding the player leaves 45 of the 50 seasons
+    distances, rows = engine.query_rows([0], range(len(STATS)), k=100)
+    assert rows.shape == (1, 45)
+    assert 1 not in engine.player_ids[rows[0]]
+    assert np.isfinite(distances).all()
+
+    result = engine.query(1, 2000, k=100)
+    assert len(result) == 45
+    assert (result['player_id'] != 1).all()
+    assert np.isfinite(result['distance']).all()
+
+
+def test_queries_with_fewer_candidates_are_padded(engine):
+    # Player 1 has one extra season, so its query has one candidate fewer than player 2's
+    players = np.append(engine.player_ids, 1)
+    years = np.append(engine.years, 2005)
+    zscores = np.vstack([engine.zscores, engine.zscores[:1]])
+    engine = SimilarSeasonsEngine(players, years, STATS, zscores, zscores)
+    distances, rows = engine.query_rows([0, 5], range(len(STATS)), k=100)
+    assert rows.shape == (2, 46)
+    assert rows[0, -1] == -1 and np.isinf(distances[0, -1])
+    assert (rows[1] >= 0).all()
+    assert len(engine.query(1, 2000, k=100)) == 45
+
+
+def test_query_unknown_season_is_empty(engine):
+    assert engine.query(1, 1990).empty
+
+
+def test_build_zscores_each_season(engine):
+    import pandas as pd
+    frame = pd.DataFrame({
+        'player_id': [1, 2, 3, 1, 2],
+        'year': [2000, 2000, 2000, 2001, 2001],
+        'a': [1.0, 2.0, 3.0, 5.0, np.nan]
+    })
+    built = SimilarSeasonsEngine.build(frame, ['a', 'missing'])
+    assert built.stats == ['a']
+    expected = [(1 - 2) / np.sqrt(2 / 3), 0.0, (3 - 2) / np.sqrt(2 / 3), 0.0, 0.0]
+    np.testing.assert_allclose(built.zscores[:, 0], expected, rtol=1e-6)
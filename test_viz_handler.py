@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from viz_handler import MLBVizHandler
+
+
+@pytest.fixture
+def viz():
+    # Scatter plots don't read the career index, so no data handler is needed
+    return MLBVizHandler(None)
+
+
+def season_frame(stat, years=10, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'player_id': np.repeat([1, 2], years),
+        'name': np.repeat(['Player A', 'Player B'], years),
+        'year': np.tile(np.arange(2020 - years, 2020), 2),
+        'hr': rng.poisson(20, 2 * years).astype('int16'),
+        stat: rng.uniform(0.1, 5, 2 * years)
+    })
+
+
+@pytest.mark.parametrize('stat, decimals, is_pitching', [('avg', 3, False), ('era', 2, True)])
+def test_rate_values_are_sent_at_display_precision(viz, stat, decimals, is_pitching):
+    data = season_frame(stat)
+    payload = json.loads(viz._encode_figure(
+        viz.create_custom_plot(data, 'hr', stat, 'scatter', is_pitching=is_pitching)
+    ))
+    sent = [value for trace in payload['data'] for value in trace['y']]
+    assert np.allclose(sent, np.round(data[stat].to_numpy(), decimals), rtol=0, atol=1e-12)
+    assert all(len(str(value).split('.')[-1]) <= decimals for value in sent)
+
+
+def test_whole_number_values_are_sent_as_integer_typed_arrays(viz):
+    payload = json.loads(viz._encode_figure(viz.create_custom_plot(season_frame('avg', years=40), 'hr', 'avg', 'scatter')))
+    assert {trace['x']['dtype'] for trace in payload['data']} == {'i1'}
+
+
+def test_a_few_whole_numbers_are_sent_as_a_plain_list(viz):
+    data = season_frame('avg', years=3)
+    payload = json.loads(viz._encode_figure(viz.create_custom_plot(data, 'hr', 'avg', 'scatter')))
+    assert [value for trace in payload['data'] for value in trace['x']] == data['hr'].tolist()
+
+
+def test_values_without_a_display_precision_keep_float64(viz):
+    data = season_frame('exotic_stat')
+    payload = json.loads(viz._encode_figure(viz.create_custom_plot(data, 'hr', 'exotic_stat', 'scatter')))
+    assert {trace['y']['dtype'] for trace in payload['data']} == {'f8'}
@@ -1,34 +1,148 @@
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import numpy as np
+import base64
+
+from lazy_imports import lazy_import
+from cache import make_cache
+from instrumentation import RenderStats
+from league_baselines import percentile_ranks
+from data_handler import widen_float32
+from stat_definitions import BATTING_RATE_STATS, PITCHING_RATE_STATS, STAT_DECIMALS
+
+px = lazy_import('plotly.express')
+go = lazy_import('plotly.graph_objects')
+pio = lazy_import('plotly.io')
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Serialized figures kept across sessions, bounded by count and by total size
+FIGURE_CACHE_SIZE = 256
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+# League plots draw individual WebGL points up to this many seasons and
+# switch to a binned density above it, so payload size stays bounded
+LEAGUE_WEBGL_MAX_POINTS = 20000
+LEAGUE_BINS = 120
+
+# Trace attributes whose float arrays are re-encoded: whole numbers as integer
+# typed arrays (or short lists), display-rounded values as plain JSON numbers
+INTEGER_ARRAY_ATTRS = ('x', 'y', 'z', 'text', 'customdata')
+
+# Arrays with at most this many decimals are shorter as JSON text ("0.285,"
+# is 6 bytes) than as base64 float64 (10.7 bytes a value)
+MAX_TEXT_DECIMALS = 3
+
+# League percentile ranks are plotted to a tenth of a point
+PERCENTILE_DECIMALS = 1
+
+# Colors for selected players
+PLAYER_COLORS = [
+    '#2E86AB',  # Blue
+    '#A23B72',  # Purple
+    '#F18F01',  # Orange
+    '#C73E1D',  # Red
+    '#3B7A57',  # Green
+]
 
 class MLBVizHandler:
     def __init__(self, data_handler):
         self.data = data_handler
-        # Define batting rate stats
-        self.batting_rate_stats = {
-            'avg', 'obp', 'slg', 'ops', 'iso', 'babip', 'woba', 'wrc_plus',
-            'o_swing_pct', 'z_swing_pct', 'swing_pct', 'o_contact_pct',
-            'z_contact_pct', 'contact_pct', 'zone_pct', 'f_strike_pct',
-            'swstr_pct', 'cstr_pct', 'csw_pct', 'gb_pct', 'fb_pct',
-            'ld_pct', 'iffb_pct', 'hr_fb', 'pull_pct', 'cent_pct',
-            'oppo_pct', 'soft_pct', 'med_pct', 'hard_pct', 'barrel_pct',
-            'hard_hit_pct'
-        }
-        # Define one comprehensive set of pitching rate stats
-        self.pitching_rate_stats = {
-            'era', 'whip', 'k_9', 'bb_9', 'hr_9', 'k_bb', 'k_pct', 'bb_pct',
-            'fip', 'xfip', 'siera', 'babip', 'lob_pct', 'gb_pct', 'fb_pct',
-            'ld_pct', 'hr_fb', 'hard_hit_pct', 'barrel_pct', 'whiff_pct',
-            'chase_rate', 'csw_rate', 'fa_pct', 'fc_pct', 'fs_pct', 'si_pct',
-            'sl_pct', 'cu_pct', 'ch_pct', 'kc_pct'
-        }
-        
-    def create_custom_plot(self, data, x_stat, y_stat, plot_type, options=None, is_pitching=False):
+        self._figure_cache = make_cache('figures', maxsize=FIGURE_CACHE_SIZE, maxbytes=FIGURE_CACHE_BYTES)
+        self.render_stats = RenderStats()
+        # Rate stats are averaged, everything else accumulates over a career
+        self.batting_rate_stats = BATTING_RATE_STATS
+        self.pitching_rate_stats = PITCHING_RATE_STATS
+        
+    def figure_key(self, player_ids, start_year, end_year, x_stat, y_stat, plot_type, options=None,
+                   is_pitching=False):
+        """Cache key for a selection's figure under the current data version"""
+        return (
+            self.data.get_data_version(),
+            tuple(sorted(int(id) for id in player_ids)),
+            int(start_year),
+            int(end_year),
+            x_stat,
+            y_stat,
+            plot_type,
+            tuple(sorted(options or [])),
+            is_pitching
+        )
+    
+    def get_plot_json(self, player_ids, start_year, end_year, x_stat, y_stat, plot_type, options=None,
+                      is_pitching=False, load_data=None):
+        """Get the figure JSON for a selection, reusing any session's earlier render of it
+
+        load_data, if given, is called on a cache miss to fetch the range stats
+        instead of querying the data handler directly.
+        """
+        options = sorted(options or [])
+        key = self.figure_key(player_ids, start_year, end_year, x_stat, y_stat, plot_type, options, is_pitching)
+        version = key[0]
+        figure_json = self._figure_cache.get(key)
+        if figure_json is not None:
+            return figure_json
+        
+        plot = 'pitching_plot' if is_pitching else 'batting_plot'
+        with self.render_stats.span(plot, plot_type, 'query'):
+            if not player_ids:
+                # League plots can be drawn without highlighting anyone
+                data = pd.DataFrame()
+            elif load_data is not None:
+                data = load_data()
+            elif is_pitching:
+                data = self.data.get_pitching_stats_range(player_ids, start_year, end_year)
+            else:
+                data = self.data.get_batting_stats_range(player_ids, start_year, end_year)
+            
+            baselines = None
+            if options:
+                baselines = self.data.get_league_baselines(
+                    stats=[x_stat, y_stat],
+                    start_year=start_year,
+                    end_year=end_year,
+                    is_pitching=is_pitching
+                )
+            
+            league = None
+            if plot_type == 'league':
+                league = self.data.get_league_points(x_stat, y_stat, start_year, end_year, is_pitching)
+        
+        with self.render_stats.span(plot, plot_type, 'build'):
+            if plot_type == 'league':
+                fig = self.create_league_plot(
+                    league=league,
+                    highlight=data,
+                    x_stat=x_stat,
+                    y_stat=y_stat,
+                    options=options,
+                    is_pitching=is_pitching,
+                    baselines=baselines
+                )
+                plotted = league
+            else:
+                fig = self.create_custom_plot(
+                    data=data,
+                    x_stat=x_stat,
+                    y_stat=y_stat,
+                    plot_type=plot_type,
+                    options=options,
+                    is_pitching=is_pitching,
+                    baselines=baselines
+                )
+                plotted = data
+        
+        with self.render_stats.span(plot, plot_type, 'serialize'):
+            figure_json = self._encode_figure(fig)
+        
+        # Don't pin a failed query's empty figure for the rest of the data version
+        if not plotted.empty and version != 'unknown':
+            self._figure_cache.set(key, figure_json)
+        return figure_json
+    
+    def create_custom_plot(self, data, x_stat, y_stat, plot_type, options=None, is_pitching=False, baselines=None):
         """Create a custom visualization based on user selections"""
         if options is None:
             options = []
+        if baselines is None:
+            baselines = pd.DataFrame(columns=['stat', 'year', 'weight', 'mean'])
             
         # Check if selected stats exist in the data
         if x_stat not in data.columns or y_stat not in data.columns:
@@ -38,92 +152,79 @@ class MLBVizHandler:
             if y_stat not in data.columns:
                 missing_stats.append(y_stat)
             
-            # Create error message figure
-            fig = go.Figure()
-            fig.add_annotation(
-                text=f"Statistics currently unavailable: {', '.join(missing_stats)}",
-                xref="paper",
-                yref="paper",
-                x=0.5,
-                y=0.5,
-                showarrow=False,
-                font=dict(size=16, color="red"),
-                align="center"
-            )
-            fig.update_layout(
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                xaxis=dict(showgrid=False, showticklabels=False),
-                yaxis=dict(showgrid=False, showticklabels=False)
-            )
-            return fig
+            return self._message_figure(f"Statistics currently unavailable: {', '.join(missing_stats)}")
             
         # Use the class-level rate stats instead of redefining
         rate_stats = self.pitching_rate_stats if is_pitching else self.batting_rate_stats
         
-        # Get player names and merge
-        player_names = self.data.get_player_names(data['player_id'].unique())
-        data = data.merge(player_names, left_on='player_id', right_on='id')
-        data = data.sort_values(['name', 'year'])
+        # Range queries already join player names; fall back to ids for bare frames
+        if 'name' not in data.columns:
+            data = data.assign(name=data['player_id'].astype(str))
+        # Range queries already arrive ordered by name and year
+        if not pd.MultiIndex.from_frame(data[['name', 'year']]).is_monotonic_increasing:
+            data = data.sort_values(['name', 'year'])
+        else:
+            data = data.copy()
         
-        # Convert stats to numeric if they aren't already
-        data[x_stat] = pd.to_numeric(data[x_stat], errors='coerce')
-        data[y_stat] = pd.to_numeric(data[y_stat], errors='coerce')
+        # The handler already returns typed columns; only the two plotted ones
+        # are widened to float64 for Plotly
+        data[x_stat] = self._plot_values(data[x_stat])
+        data[y_stat] = self._plot_values(data[y_stat])
         
-        # Define a custom color palette
-        custom_colors = [
-            '#2E86AB',  # Blue
-            '#A23B72',  # Purple
-            '#F18F01',  # Orange
-            '#C73E1D',  # Red
-            '#3B7A57',  # Green
-        ]
+        # Swap raw y values for league percentile ranks (not meaningful for cumulative lines)
+        show_percentiles = 'percentile' in options and plot_type != 'line'
+        if show_percentiles:
+            data[y_stat] = percentile_ranks(
+                data['year'], data[y_stat], baselines[baselines['stat'] == y_stat]
+            )
+        
+        # Plot values at display precision; the digits past it only cost payload
+        data[x_stat] = _display_round(data[x_stat], x_stat)
+        data[y_stat] = np.round(data[y_stat], PERCENTILE_DECIMALS) if show_percentiles else _display_round(data[y_stat], y_stat)
         
         if plot_type == "line":
-            # Calculate cumulative stats only for non-rate statistics
-            if x_stat not in rate_stats:
-                data[f'{x_stat}_plot'] = data.groupby('name')[x_stat].cumsum()
-                x_label = f'Cumulative {x_stat.replace("_", " ").title()}'
-            else:
-                data[f'{x_stat}_plot'] = data[x_stat]
-                x_label = x_stat.replace("_", " ").title()
+            # Running career values from the start of the range, read off the
+            # prefix-sum index so rate stats are weighted (e.g. career AVG = H/AB)
+            career = self.data.get_career_index(is_pitching)
+            range_start = data['year'].min()
+            data[f'{x_stat}_plot'], x_label = self._career_values(career, data, x_stat, range_start, rate_stats)
+            data[f'{y_stat}_plot'], y_label = self._career_values(career, data, y_stat, range_start, rate_stats)
             
-            if y_stat not in rate_stats:
-                data[f'{y_stat}_plot'] = data.groupby('name')[y_stat].cumsum()
-                y_label = f'Cumulative {y_stat.replace("_", " ").title()}'
-            else:
-                data[f'{y_stat}_plot'] = data[y_stat]
-                y_label = y_stat.replace("_", " ").title()
+            # Rows are sorted by name and year, so each player is one contiguous
+            # run; slice the columns once rather than filtering per player
+            names = data['name'].astype(str).to_numpy()
+            x_values = _display_round(data[f'{x_stat}_plot'].to_numpy(), x_stat)
+            y_values = _display_round(data[f'{y_stat}_plot'].to_numpy(), y_stat)
+            years = data['year'].to_numpy()
+            breaks = np.flatnonzero(names[1:] != names[:-1]) + 1
+            starts = np.concatenate([[0], breaks])
+            ends = np.concatenate([breaks, [len(names)]])
             
-            fig = px.scatter(
-                data,
-                x=f'{x_stat}_plot',
-                y=f'{y_stat}_plot',
-                color='name',
-                text='year',
+            # One lines+markers trace per player instead of a marker trace plus a
+            # line trace; plain dicts so Plotly validates each trace only once
+            traces = [
+                dict(
+                    type='scatter',
+                    x=x_values[start:end],
+                    y=y_values[start:end],
+                    text=years[start:end],
+                    mode='lines+markers+text',
+                    name=names[start],
+                    legendgroup=names[start],
+                    line=dict(color=PLAYER_COLORS[idx % len(PLAYER_COLORS)]),
+                    marker=dict(color=PLAYER_COLORS[idx % len(PLAYER_COLORS)])
+                )
+                for idx, (start, end) in enumerate(zip(starts, ends))
+                if end > start
+            ]
+            fig = go.Figure(data=traces)
+            fig.update_layout(
                 title=f"{y_label} vs {x_label}",
-                labels={
-                    f'{x_stat}_plot': x_label,
-                    f'{y_stat}_plot': y_label,
-                    'name': 'Player'
-                },
-                color_discrete_sequence=custom_colors
+                xaxis_title=x_label,
+                yaxis_title=y_label,
+                legend_title_text='Player'
             )
             
-            # Add connecting lines with matching colors
-            for idx, player in enumerate(data['name'].unique()):
-                player_data = data[data['name'] == player].sort_values('year')
-                fig.add_trace(
-                    go.Scatter(
-                        x=player_data[f'{x_stat}_plot'],
-                        y=player_data[f'{y_stat}_plot'],
-                        mode='lines',
-                        name=player,
-                        showlegend=False,
-                        line=dict(color=custom_colors[idx % len(custom_colors)])
-                    )
-                )
-            
             # Update hover template
             fig.update_traces(
                 hovertemplate="<br>".join([
@@ -140,7 +241,8 @@ class MLBVizHandler:
                 x=x_stat,
                 y=y_stat,
                 color='name',
-                hover_data=['year', 'name'],
+                # The color grouping already puts the name in each trace's hover
+                hover_data=['year'],
                 title=f"{y_stat.replace('_', ' ').title()} vs {x_stat.replace('_', ' ').title()}"
             )
             
@@ -161,6 +263,144 @@ class MLBVizHandler:
                 title=f"{y_stat.replace('_', ' ').title()} Distribution by Player"
             )
         
+        if show_percentiles:
+            fig.update_yaxes(title_text=f"{y_stat.replace('_', ' ').title()} (League Percentile)", range=[0, 100])
+        
+        if 'league_avg' in options:
+            self._add_league_baselines(fig, baselines, x_stat, y_stat, plot_type, rate_stats, show_percentiles)
+        
+        self._apply_layout(fig)
+        
+        return fig 
+
+    def create_league_plot(self, league, highlight, x_stat, y_stat, options=None, is_pitching=False, baselines=None):
+        """Plot every qualifying season in the range, with selected players on top"""
+        if options is None:
+            options = []
+        if baselines is None:
+            baselines = pd.DataFrame(columns=['stat', 'year', 'weight', 'mean'])
+        if league.empty:
+            return self._message_figure("No qualifying seasons in this range")
+        
+        rate_stats = self.pitching_rate_stats if is_pitching else self.batting_rate_stats
+        x_label = x_stat.replace('_', ' ').title()
+        y_label = y_stat.replace('_', ' ').title()
+        x_values = self._plot_values(league['x']).to_numpy()
+        y_values = self._plot_values(league['y']).to_numpy()
+        
+        traces = []
+        if len(league) <= LEAGUE_WEBGL_MAX_POINTS:
+            traces.append(dict(
+                type='scattergl',
+                x=_display_round(x_values, x_stat),
+                y=_display_round(y_values, y_stat),
+                customdata=league['year'].to_numpy(),
+                mode='markers',
+                name='League seasons',
+                marker=dict(color='#8A96A3', size=4, opacity=0.35),
+                hovertemplate=f"{x_label}: %{{x}}<br>{y_label}: %{{y}}<br>Year: %{{customdata}}<extra></extra>"
+            ))
+        else:
+            # Too many points to ship: bin on the server and send counts instead
+            counts, x_edges, y_edges = np.histogram2d(x_values, y_values, bins=LEAGUE_BINS)
+            # float32 holds the counts exactly at half the payload; empty bins stay transparent
+            counts = counts.astype('float32')
+            counts[counts == 0] = np.nan
+            traces.append(dict(
+                type='heatmap',
+                x=(x_edges[:-1] + x_edges[1:]) / 2,
+                y=(y_edges[:-1] + y_edges[1:]) / 2,
+                z=counts.T,
+                colorscale='Blues',
+                colorbar=dict(title='Seasons'),
+                name='League seasons',
+                hovertemplate=f"{x_label}: %{{x:.4~g}}<br>{y_label}: %{{y:.4~g}}<br>Seasons: %{{z}}<extra></extra>"
+            ))
+        
+        if not highlight.empty and x_stat in highlight.columns and y_stat in highlight.columns:
+            names = highlight['name'].astype(str).to_numpy()
+            highlight_x = _display_round(self._plot_values(highlight[x_stat]).to_numpy(), x_stat)
+            highlight_y = _display_round(self._plot_values(highlight[y_stat]).to_numpy(), y_stat)
+            years = highlight['year'].to_numpy()
+            breaks = np.flatnonzero(names[1:] != names[:-1]) + 1
+            for idx, (start, end) in enumerate(zip(np.concatenate([[0], breaks]), np.concatenate([breaks, [len(names)]]))):
+                traces.append(dict(
+                    type='scatter',
+                    x=highlight_x[start:end],
+                    y=highlight_y[start:end],
+                    text=years[start:end],
+                    mode='markers',
+                    name=names[start],
+                    marker=dict(
+                        color=PLAYER_COLORS[idx % len(PLAYER_COLORS)],
+                        size=10,
+                        line=dict(color='white', width=1)
+                    ),
+                    hovertemplate=f"{names[start]} %{{text}}<br>{x_label}: %{{x}}<br>{y_label}: %{{y}}<extra></extra>"
+                ))
+        
+        fig = go.Figure(data=traces)
+        fig.update_layout(
+            title=f"{y_label} vs {x_label}: {len(league):,} Qualified Seasons",
+            xaxis_title=x_label,
+            yaxis_title=y_label
+        )
+        if 'league_avg' in options:
+            self._add_league_baselines(fig, baselines, x_stat, y_stat, 'league', rate_stats, False)
+        self._apply_layout(fig)
+        return fig
+
+    def _encode_figure(self, fig):
+        """Figure JSON without the default template, with whole-number arrays as integers
+
+        The browser already holds the template (see plot_template_json), so
+        leaving it out saves ~7 KB per figure. Counts and years are widened to
+        float64 for plotting; sending them as i2/i4 typed arrays instead of f8
+        cuts their share of the payload by half or more. Rate stats arrive
+        rounded to their display decimals (see _display_round) and go out as
+        JSON numbers, which are shorter than their f8 bytes and compress well.
+        """
+        # Edit the plain dict; assigning to the figure would re-validate every trace
+        figure = fig.to_plotly_json()
+        figure['layout'].pop('template', None)
+        for trace in figure['data']:
+            for attr in INTEGER_ARRAY_ATTRS:
+                values = _float_values(trace.get(attr))
+                if values is not None and len(values):
+                    integers = _as_integers(values)
+                    if integers is not None:
+                        trace[attr] = _compact_integers(integers)
+                    elif _has_short_decimals(values):
+                        trace[attr] = values.tolist()
+        return pio.json.to_json_plotly(figure)
+
+    def get_message_json(self, message):
+        """Figure JSON for a blank plot carrying a message, e.g. in place of a failed render"""
+        return self._encode_figure(self._message_figure(message))
+
+    def _message_figure(self, message):
+        """Blank figure carrying a centered message"""
+        fig = go.Figure()
+        fig.add_annotation(
+            text=message,
+            xref="paper",
+            yref="paper",
+            x=0.5,
+            y=0.5,
+            showarrow=False,
+            font=dict(size=16, color="red"),
+            align="center"
+        )
+        fig.update_layout(
+            plot_bgcolor='white',
+            paper_bgcolor='white',
+            xaxis=dict(showgrid=False, showticklabels=False),
+            yaxis=dict(showgrid=False, showticklabels=False)
+        )
+        return fig
+
+    def _apply_layout(self, fig):
+        """Shared styling for every plot"""
         # Update layout for better appearance
         fig.update_layout(
             hovermode='closest',
@@ -191,5 +431,107 @@ class MLBVizHandler:
             gridwidth=1,
             gridcolor='LightGray'
         )
+
+    def _plot_values(self, series):
+        """Plain float64 values for a plotted column"""
+        if series.dtype == 'float64':
+            return series
+        if series.dtype == 'object':
+            return pd.to_numeric(series, errors='coerce')
+        values = series.to_numpy(dtype='float64', na_value=np.nan)
+        if series.dtype == 'float32':
+            values = widen_float32(values)
+        return pd.Series(values, index=series.index, name=series.name)
+
+    def _career_values(self, career, data, stat, range_start, rate_stats):
+        """Running career value of a stat at each row, with its axis label"""
+        label = stat.replace("_", " ").title()
+        if career is None or not career.supports(stat) or data.empty:
+            if stat in rate_stats or stat == 'year':
+                return data[stat], label
+            return data.groupby('name')[stat].cumsum(), f'Cumulative {label}'
+        
+        values = career.value(stat, data['player_id'], range_start, data['year'])
+        if stat in rate_stats:
+            return values, f'Career {label}'
+        return values, f'Cumulative {label}'
+
+    def _add_league_baselines(self, fig, baselines, x_stat, y_stat, plot_type, rate_stats, show_percentiles):
+        """Overlay league average reference lines on a finished figure"""
+        line_style = dict(color='gray', width=1.5, dash='dash')
+        
+        if show_percentiles:
+            fig.add_hline(y=50, line=line_style, annotation_text="League median")
+        elif self._has_league_baseline(y_stat, plot_type, rate_stats):
+            league_avg = self._league_average(baselines, y_stat)
+            if league_avg is not None:
+                fig.add_hline(y=league_avg, line=line_style, annotation_text=f"League avg: {league_avg:.3f}")
         
-        return fig 
\ No newline at end of file
+        # Bar and box plots put player names on the x-axis
+        if plot_type in ("line", "scatter") and self._has_league_baseline(x_stat, plot_type, rate_stats):
+            league_avg = self._league_average(baselines, x_stat)
+            if league_avg is not None:
+                fig.add_vline(x=league_avg, line=line_style, annotation_text=f"League avg: {league_avg:.3f}")
+
+    def _has_league_baseline(self, stat, plot_type, rate_stats):
+        """Line plots accumulate counting stats, so only rate stats compare to the league"""
+        return plot_type != "line" or stat in rate_stats
+
+    def _league_average(self, baselines, stat):
+        """Playing-time weighted league mean of a stat across the seasons in baselines"""
+        stat_rows = baselines[baselines['stat'] == stat].dropna(subset=['mean', 'weight'])
+        if stat_rows.empty:
+            return None
+        return float(np.average(stat_rows['mean'], weights=stat_rows['weight']))
+
+
+def _display_round(values, stat):
+    """values rounded to the stat's display decimals; stats without an entry pass through"""
+    decimals = STAT_DECIMALS.get(stat)
+    if decimals is None:
+        return values
+    return np.round(values, decimals)
+
+
+def _float_values(values):
+    """A trace attribute's values as a 1-d float array, whether Plotly holds an
+    array or has already packed it into a base64 f8 typed array; None otherwise"""
+    if isinstance(values, np.ndarray) and values.dtype.kind == 'f':
+        return values
+    if isinstance(values, dict) and values.get('dtype') == 'f8' and 'shape' not in values:
+        return np.frombuffer(base64.b64decode(values['bdata']), dtype='f8')
+    return None
+
+
+def _compact_integers(values):
+    """Whole numbers as a base64 integer typed array, or as a plain list when
+    that's shorter (a handful of small numbers)"""
+    magnitudes = np.abs(values.astype('int64'))
+    digits = np.floor(np.log10(np.maximum(magnitudes, 1))) + 1
+    list_bytes = int(digits.sum() + (values < 0).sum()) + len(values) + 1
+    typed = {'dtype': values.dtype.str.lstrip('<|'), 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+    # The typed array's dict adds {"dtype":"i2","bdata":""} around the base64
+    if len(typed['bdata']) + 26 < list_bytes:
+        return typed
+    return values.tolist()
+
+
+def _has_short_decimals(values):
+    """Whether every value is finite with at most MAX_TEXT_DECIMALS decimals"""
+    return bool(np.isfinite(values).all()) and np.array_equal(values, np.round(values, MAX_TEXT_DECIMALS))
+
+
+def _as_integers(values):
+    """values as the smallest integer dtype that holds them, or None if any aren't whole numbers"""
+    if not np.isfinite(values).all() or not np.array_equal(values, np.round(values)):
+        return None
+    low, high = values.min(), values.max()
+    for dtype in ('int8', 'int16', 'int32'):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return None
+
+
+def plot_template_json():
+    """The default Plotly template, sent to the browser once instead of inside every figure"""
+    return pio.json.to_json_plotly(pio.templates[pio.templates.default].to_plotly_json())
@@ -0,0 +1,133 @@
+from concurrent.futures import ThreadPoolExecutor
+from instrumentation import Histogram, LATENCY_BUCKETS_MS
+import threading
+import asyncio
+import time
+import os
+
+# Threads for blocking database and Plotly work; queries and serialization
+# spend most of their time outside the GIL, so threads beat processes here
+# and the handlers' in-memory indexes and caches stay shared
+RENDER_WORKERS = int(os.getenv('MLB_RENDER_WORKERS', 4))
+
+
+class CallOnce:
+    """Thread-safe zero-argument call evaluated on first use and remembered"""
+
+    def __init__(self, fn):
+        self._fn = fn
+        self._lock = threading.Lock()
+        self._done = False
+        self._value = None
+
+    def __call__(self):
+        if not self._done:
+            with self._lock:
+                if not self._done:
+                    self._value = self._fn()
+                    self._done = True
+        return self._value
+
+
+class WorkerPool:
+    """Bounded thread pool that keeps blocking work off the event loop, with saturation metrics"""
+
+    def __init__(self, max_workers=RENDER_WORKERS, name='render'):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"mlb-{name}")
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.active = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.queue_wait_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.run_ms = Histogram(LATENCY_BUCKETS_MS)
+
+    async def run(self, fn, *args, **kwargs):
+        """Run fn on a worker thread; cancelling the await drops it if it hasn't started"""
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        def task():
+            started_at = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.queue_wait_ms.observe((started_at - submitted_at) * 1000)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.run_ms.observe((time.perf_counter() - started_at) * 1000)
+
+        future = self._executor.submit(task)
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.cancelled += 1
+                # Work already running finishes in the background and is discarded
+                if future.cancel():
+                    self.queued -= 1
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'active': self.active,
+                'queued': self.queued,
+                'peak_queued': self.peak_queued,
+                'saturation': self.active / self.max_workers,
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'queue_wait_ms': self.queue_wait_ms.snapshot(),
+                'run_ms': self.run_ms.snapshot()
+            }
+
+    def prometheus_text(self):
+        """Prometheus text exposition of the pool's load, labelled by process"""
+        labels = f'pool="{self.name}",pid="{os.getpid()}"'
+        with self._lock:
+            lines = [
+                '# HELP mlb_pool_workers Worker threads in the pool',
+                '# TYPE mlb_pool_workers gauge',
+                f'mlb_pool_workers{{{labels}}} {self.max_workers}',
+                '# HELP mlb_pool_active Tasks currently running',
+                '# TYPE mlb_pool_active gauge',
+                f'mlb_pool_active{{{labels}}} {self.active}',
+                '# HELP mlb_pool_queued Tasks waiting for a worker',
+                '# TYPE mlb_pool_queued gauge',
+                f'mlb_pool_queued{{{labels}}} {self.queued}',
+                '# HELP mlb_pool_tasks_total Tasks by outcome',
+                '# TYPE mlb_pool_tasks_total counter',
+                f'mlb_pool_tasks_total{{{labels},outcome="completed"}} {self.completed}',
+                f'mlb_pool_tasks_total{{{labels},outcome="failed"}} {self.failed}',
+                f'mlb_pool_tasks_total{{{labels},outcome="cancelled"}} {self.cancelled}',
+                '# HELP mlb_pool_queue_wait_ms Time tasks waited for a worker',
+                '# TYPE mlb_pool_queue_wait_ms histogram'
+            ]
+            lines.extend(self.queue_wait_ms.prometheus_lines('mlb_pool_queue_wait_ms', labels))
+            lines.extend([
+                '# HELP mlb_pool_run_ms Time tasks spent running',
+                '# TYPE mlb_pool_run_ms histogram'
+            ])
+            lines.extend(self.run_ms.prometheus_lines('mlb_pool_run_ms', labels))
+        return '\n'.join(lines) + '\n'